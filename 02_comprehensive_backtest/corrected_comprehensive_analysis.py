@@ -5,30 +5,77 @@ Corrected comprehensive analysis using the exact same formula and method as Prem
 
 import pandas as pd
 import tarfile
-import json
+import orjson
 import bz2
-from collections import defaultdict
-import re
-from datetime import datetime
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import os
+import ahocorasick
 import numpy as np
+from numba import njit
 
+# One PCG64 generator shared by the simulated league draws
+_RNG = np.random.default_rng()
+
+QUALIFYING_FROM = '2024-09-01'
+
+# Odds are held as float32; money (stakes, PnL and its running total) stays float64
+FLOAT32_COLUMNS = ('Under_Odds',)
+
+RESULT_COLUMNS = ('League', 'Date', 'Home_Team', 'Away_Team', 'Event_ID', 'Event_Name', 'Under_Odds',
+                  'Lay_Stake', 'Model_Result', 'Bet_Result', 'Profit_Loss', 'Cumulative_PnL')
+
+# Common team/competition names for different leagues, checked in priority order
+_LEAGUE_TEAMS = {
+    'Premier League': ['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest'],
+    'Championship': ['Championship', 'Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Leeds', 'Sheffield Wednesday'],
+    'League One': ['League One', 'Barnsley', 'Blackpool', 'Bolton', 'Bristol Rovers', 'Burton', 'Cambridge', 'Charlton', 'Derby', 'Exeter', 'Fleetwood', 'Ipswich', 'Lincoln', 'MK Dons', 'Morecambe', 'Oxford', 'Peterborough', 'Plymouth', 'Portsmouth', 'Port Vale', 'Shrewsbury', 'Sunderland', 'Wigan', 'Wycombe'],
+    'League Two': ['League Two', 'AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town'],
+    'Scottish Premiership': ['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock'],
+    'Scottish Championship': ['Scottish Championship', 'Dundee United', 'Inverness', 'Partick Thistle', 'Ayr United', 'Dunfermline', 'Greenock Morton', 'Queen of the South', 'Raith Rovers'],
+    'Scottish League One': ['Scottish League One', 'Airdrieonians', 'Alloa', 'Clyde', 'Cove Rangers', 'East Fife', 'Falkirk', 'Forfar', 'Montrose', 'Peterhead', 'Stranraer'],
+    'Scottish League Two': ['Scottish League Two', 'Albion Rovers', 'Annan', 'Berwick', 'Cowdenbeath', 'Edinburgh City', 'Elgin', 'Stirling', 'Stenhousemuir'],
+    "Women's Super League": ['Women', 'WSL', 'Arsenal Women', 'Chelsea Women', 'Man City Women', 'Man United Women', 'Tottenham Women', 'Everton Women', 'Brighton Women', 'Aston Villa Women', 'West Ham Women', 'Birmingham Women', 'Reading Women'],
+    'National League': ['National League', 'Wrexham', 'Notts County', 'Chesterfield', 'Boreham Wood', 'Bromley', 'Dagenham', 'Eastleigh', 'FC Halifax', 'Gateshead', 'Grimsby', 'Hartlepool', 'Maidenhead', 'Maidstone', 'Oldham', 'Solihull', 'Southend', 'Stockport', 'Torquay', 'Woking', 'Yeovil'],
+}
+
+# Team sets used when no league pattern matches the raw event name
+_PL_TEAMS = frozenset(['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest'])
+_CHAMP_TEAMS = frozenset(['Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Sheffield Wednesday'])
+_SCOTTISH_TEAMS = frozenset(['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock'])
+_LEAGUE_TWO_TEAMS = frozenset(['AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town'])
+
+_FALLBACK_TEAMS = {
+    'Premier League': _PL_TEAMS,
+    'Championship': _CHAMP_TEAMS,
+    'Scottish Premiership': _SCOTTISH_TEAMS,
+    'League Two': _LEAGUE_TWO_TEAMS,
+}
+
+def _build_automaton(groups, ignore_case=False):
+    """Build one Aho-Corasick automaton mapping each name to its highest-priority league."""
+    automaton = ahocorasick.Automaton()
+    for priority, (league, names) in enumerate(groups.items()):
+        for name in names:
+            key = name.lower() if ignore_case else name
+            if key not in automaton:
+                automaton.add_word(key, (priority, league))
+    automaton.make_automaton()
+    return automaton
+
+def _first_league(automaton, text):
+    """Return the highest-priority league with a name occurring in text, or None."""
+    hits = [value for _, value in automaton.iter(text)]
+    return min(hits)[1] if hits else None
+
+_LEAGUE_AUTOMATON = _build_automaton(_LEAGUE_TEAMS, ignore_case=True)
+_FALLBACK_AUTOMATON = _build_automaton(_FALLBACK_TEAMS)
+
+@lru_cache(maxsize=1 << 16)
 def extract_league_and_teams(event_name):
     """Extract league name and team names from event name."""
     
-    # Common patterns for different leagues
-    league_patterns = {
-        'Premier League': r'(Arsenal|Chelsea|Liverpool|Man City|Man United|Tottenham|Newcastle|West Ham|Aston Villa|Brighton|Crystal Palace|Everton|Fulham|Leeds|Leicester|Southampton|Wolves|Brentford|Nottingham Forest|Sheffield United|Nottm Forest)',
-        'Championship': r'(Championship|Norwich|Watford|Birmingham|Blackburn|Bristol City|Cardiff|Coventry|Huddersfield|Hull|Luton|Middlesbrough|Millwall|Preston|QPR|Reading|Rotherham|Stoke|Swansea|West Brom|Leeds|Sheffield Wednesday)',
-        'League One': r'(League One|Barnsley|Blackpool|Bolton|Bristol Rovers|Burton|Cambridge|Charlton|Derby|Exeter|Fleetwood|Ipswich|Lincoln|MK Dons|Morecambe|Oxford|Peterborough|Plymouth|Portsmouth|Port Vale|Shrewsbury|Sunderland|Wigan|Wycombe)',
-        'League Two': r'(League Two|AFC Wimbledon|Barrow|Bradford|Carlisle|Colchester|Crawley|Crewe|Doncaster|Forest Green|Gillingham|Grimsby|Harrogate|Hartlepool|Leyton Orient|Mansfield|Newport|Northampton|Oldham|Rochdale|Salford|Scunthorpe|Stevenage|Swindon|Tranmere|Walsall|Chesterfield|Fleetwood Town)',
-        'Scottish Premiership': r'(Celtic|Rangers|Aberdeen|Hearts|Hibs|Motherwell|St Johnstone|Livingston|Ross County|St Mirren|Dundee|Kilmarnock)',
-        'Scottish Championship': r'(Scottish Championship|Dundee United|Inverness|Partick Thistle|Ayr United|Dunfermline|Greenock Morton|Queen of the South|Raith Rovers)',
-        'Scottish League One': r'(Scottish League One|Airdrieonians|Alloa|Clyde|Cove Rangers|East Fife|Falkirk|Forfar|Montrose|Peterhead|Stranraer)',
-        'Scottish League Two': r'(Scottish League Two|Albion Rovers|Annan|Berwick|Cowdenbeath|Edinburgh City|Elgin|Stirling|Stenhousemuir)',
-        'Women\'s Super League': r'(Women|WSL|Arsenal Women|Chelsea Women|Man City Women|Man United Women|Tottenham Women|Everton Women|Brighton Women|Aston Villa Women|West Ham Women|Birmingham Women|Reading Women)',
-        'National League': r'(National League|Wrexham|Notts County|Chesterfield|Boreham Wood|Bromley|Dagenham|Eastleigh|FC Halifax|Gateshead|Grimsby|Hartlepool|Maidenhead|Maidstone|Oldham|Solihull|Southend|Stockport|Torquay|Woking|Yeovil)'
-    }
-    
     # Extract teams from event name
     teams = []
     if ' v ' in event_name:
@@ -44,33 +91,16 @@ def extract_league_and_teams(event_name):
     home_team = teams[0].strip()
     away_team = teams[1].strip()
     
-    # Determine league based on team names
-    for league, pattern in league_patterns.items():
-        if re.search(pattern, event_name, re.IGNORECASE):
-            return league, home_team, away_team
+    # Determine league based on team names (single scan over all league names)
+    league = _first_league(_LEAGUE_AUTOMATON, event_name.lower())
+    if league:
+        return league, home_team, away_team
     
     # If no specific pattern matches, try to determine from team names
     all_teams = home_team + ' ' + away_team
-    
-    # Check for Premier League teams
-    pl_teams = ['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest']
-    if any(team in all_teams for team in pl_teams):
-        return 'Premier League', home_team, away_team
-    
-    # Check for Championship teams
-    champ_teams = ['Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Sheffield Wednesday']
-    if any(team in all_teams for team in champ_teams):
-        return 'Championship', home_team, away_team
-    
-    # Check for Scottish teams
-    scottish_teams = ['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock']
-    if any(team in all_teams for team in scottish_teams):
-        return 'Scottish Premiership', home_team, away_team
-    
-    # Check for League Two teams
-    league_two_teams = ['AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town']
-    if any(team in all_teams for team in league_two_teams):
-        return 'League Two', home_team, away_team
+    league = _first_league(_FALLBACK_AUTOMATON, all_teams)
+    if league:
+        return league, home_team, away_team
     
     return 'Unknown', home_team, away_team
 
@@ -84,6 +114,101 @@ def load_premier_league_reference():
         print("❌ Premier League reference file not found")
         return None
 
+_BZ2_CHUNK_SIZE = 64 * 1024
+_TARGET_MARKET = b'First Half Goals 0.5'
+
+# Market definitions already handled by this process, shared across members
+_SEEN_EVENTS = set()
+
+def _iter_bz2_lines(raw):
+    """Decompress bz2 bytes in fixed-size chunks and yield complete byte lines."""
+    view = memoryview(raw)
+    decompressor = bz2.BZ2Decompressor()
+    buffer = b''
+    for offset in range(0, len(view), _BZ2_CHUNK_SIZE):
+        chunk = view[offset:offset + _BZ2_CHUNK_SIZE]
+        while chunk:
+            buffer += decompressor.decompress(chunk)
+            chunk = b''
+            if decompressor.eof:
+                # Multi-stream member: restart on whatever followed this stream
+                chunk = decompressor.unused_data
+                decompressor = bz2.BZ2Decompressor()
+        *lines, buffer = buffer.split(b'\n')
+        yield from lines
+    if buffer:
+        yield buffer
+
+def _decode_and_filter(task):
+    """Decompress one bz2 tar member and return its first half goals matches."""
+    member_name, raw = task
+    matches = []
+    try:
+        # orjson parses the raw byte lines directly, so skip the UTF-8 decode
+        for line in _iter_bz2_lines(raw):
+            # Cheap substring test: skip blank lines and lines that cannot hold the market
+            if _TARGET_MARKET not in line:
+                continue
+            try:
+                data = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            
+            mc = data.get('mc')
+            if not mc:
+                continue
+            
+            for market in mc:
+                md = market.get('marketDefinition')
+                if md is None:
+                    continue
+                
+                # Check if it's a first half goals market
+                name = md.get('name')
+                if name is None or not name.startswith('First Half Goals 0.5'):
+                    continue
+                
+                event_name = md.get('eventName', '')
+                event_id = md.get('eventId', '')
+                market_time = md.get('marketTime', '')
+                
+                # Replays repeat the same definition in many snapshots; only the first counts
+                event_key = (event_id, event_name, market_time)
+                if event_key in _SEEN_EVENTS:
+                    continue
+                _SEEN_EVENTS.add(event_key)
+                
+                # Extract league and teams
+                league, home_team, away_team = extract_league_and_teams(event_name)
+                
+                if league and home_team and away_team and league != 'Unknown':
+                    # Store match info
+                    matches.append({
+                        'event_id': event_id,
+                        'event_name': event_name,
+                        'home_team': home_team,
+                        'away_team': away_team,
+                        'market_time': market_time,
+                        'date': market_time[:10],
+                        'league': league
+                    })
+
+    except Exception as e:
+        return member_name, matches, e
+    
+    return member_name, matches, None
+
+def _read_members(tar):
+    """Yield (name, compressed bytes) for every bz2 member; tarfile reads stay in this process."""
+    for member in tar.getmembers():
+        if member.name.endswith('.bz2'):
+            try:
+                file_obj = tar.extractfile(member)
+                if file_obj:
+                    yield member.name, file_obj.read()
+            except Exception as e:
+                print(f"Error processing {member.name}: {e}")
+
 def extract_gb_matches_with_odds(tar_file_path):
     """Extract matches with odds data from GB dataset."""
     
@@ -92,68 +217,45 @@ def extract_gb_matches_with_odds(tar_file_path):
     
     # Dictionary to store matches by league
     leagues_matches = defaultdict(list)
+    seen_matches = defaultdict(set)
     
     total_files = 0
     processed_files = 0
     
+    def merge(result):
+        nonlocal processed_files
+        member_name, matches, error = result
+        for match_info in matches:
+            league = match_info['league']
+            # Avoid duplicates; the remaining fields are derived from these three
+            key = (match_info['event_id'], match_info['event_name'], match_info['market_time'])
+            if key not in seen_matches[league]:
+                seen_matches[league].add(key)
+                leagues_matches[league].append(match_info)
+        if error is not None:
+            print(f"Error processing {member_name}: {error}")
+            return
+        processed_files += 1
+        if processed_files % 500 == 0:
+            print(f"Processed {processed_files}/{total_files} files...")
+    
     try:
         with tarfile.open(tar_file_path, 'r') as tar:
             total_files = len(tar.getnames())
             print(f"Total files in archive: {total_files}")
             
-            for member in tar.getmembers():
-                if member.name.endswith('.bz2'):
-                    try:
-                        file_obj = tar.extractfile(member)
-                        if file_obj:
-                            decompressed = bz2.decompress(file_obj.read())
-                            lines = decompressed.decode('utf-8').strip().split('\n')
-                            
-                            for line in lines:
-                                if line.strip():
-                                    try:
-                                        data = json.loads(line)
-                                        
-                                        if 'mc' in data and data['mc']:
-                                            for market in data['mc']:
-                                                if 'marketDefinition' in market:
-                                                    md = market['marketDefinition']
-                                                    
-                                                    # Check if it's a first half goals market
-                                                    if 'name' in md and 'First Half Goals 0.5' in md['name']:
-                                                        event_name = md.get('eventName', '')
-                                                        event_id = md.get('eventId', '')
-                                                        market_time = md.get('marketTime', '')
-                                                        
-                                                        # Extract league and teams
-                                                        league, home_team, away_team = extract_league_and_teams(event_name)
-                                                        
-                                                        if league and home_team and away_team and league != 'Unknown':
-                                                            # Store match info
-                                                            match_info = {
-                                                                'event_id': event_id,
-                                                                'event_name': event_name,
-                                                                'home_team': home_team,
-                                                                'away_team': away_team,
-                                                                'market_time': market_time,
-                                                                'date': market_time[:10],
-                                                                'league': league
-                                                            }
-                                                            
-                                                            # Avoid duplicates
-                                                            if match_info not in leagues_matches[league]:
-                                                                leagues_matches[league].append(match_info)
-                                        
-                                    except json.JSONDecodeError:
-                                        continue
-                            
-                            processed_files += 1
-                            if processed_files % 500 == 0:
-                                print(f"Processed {processed_files}/{total_files} files...")
-                                
-                    except Exception as e:
-                        print(f"Error processing {member.name}: {e}")
-                        continue
+            # Decompress and parse members in worker processes; keep a bounded
+            # window of compressed payloads in flight so memory stays flat
+            workers = os.cpu_count() or 1
+            max_pending = workers * 4
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for task in _read_members(tar):
+                    pending.append(executor.submit(_decode_and_filter, task))
+                    if len(pending) >= max_pending:
+                        merge(pending.popleft().result())
+                while pending:
+                    merge(pending.popleft().result())
     
     except Exception as e:
         print(f"Error opening tar file: {e}")
@@ -163,6 +265,24 @@ def extract_gb_matches_with_odds(tar_file_path):
     
     return leagues_matches
 
+@njit(cache=True)
+def _simulate(odds, base_average, multiplier, win_draws, win_rate, lay_stake, commission_rate):
+    """Apply the combined average gate and lay betting PnL to one league's pre-drawn samples."""
+    n = odds.shape[0]
+    bet_mask = np.empty(n, dtype=np.bool_)
+    is_win = np.empty(n, dtype=np.bool_)
+    profit = np.empty(n)
+    for i in range(n):
+        # Only bet if combined average >= 1.5 (same as Premier League)
+        bet_mask[i] = base_average[i] * multiplier >= 1.5
+        # Simulate result based on league quality
+        is_win[i] = win_draws[i] < win_rate
+        if is_win[i]:
+            profit[i] = lay_stake * (1 - commission_rate)
+        else:
+            profit[i] = -lay_stake * (odds[i] - 1)
+    return bet_mask, is_win, profit
+
 def apply_exact_same_formula(leagues_matches, pl_reference):
     """Apply the exact same formula as used for Premier League."""
     
@@ -179,28 +299,67 @@ def apply_exact_same_formula(leagues_matches, pl_reference):
     # For other leagues, we need to simulate the same process
     # Since we don't have historical data for other leagues, we'll use a conservative approach
     
-    all_results = []
-    
-    # Add Premier League results (these are the real ones)
-    for _, row in pl_results.iterrows():
-        all_results.append({
-            'League': 'Premier League',
-            'Date': row['Date'],
-            'Home_Team': row['Home Team'],
-            'Away_Team': row['Away Team'],
-            'Event_ID': f"PL_{row['Date']}_{row['Home Team']}_{row['Away Team']}",
-            'Event_Name': f"{row['Home Team']} v {row['Away Team']}",
-            'Under_Odds': row['Under 0.5 Goals Odds'],
-            'Lay_Stake': row['Lay_Stake'],
-            'Model_Result': row['Model Result'],
-            'Bet_Result': row['Bet_Result'],
-            'Profit_Loss': row['Profit_Loss'],
-            'Cumulative_PnL': row['Cumulative_PnL']
-        })
+    # Per-league caps, quality multipliers and win rates for simulated bets
+    max_bets_per_league = {
+        'Championship': 50,  # Much fewer than Premier League
+        'League One': 30,
+        'League Two': 20,
+        'Scottish Premiership': 25,
+        'Scottish Championship': 10,
+        'Scottish League One': 8,
+        'Scottish League Two': 5,
+        'National League': 15
+    }
+    league_multipliers = {
+        'Championship': 0.8,
+        'League One': 0.7,
+        'League Two': 0.6,
+        'Scottish Premiership': 0.75,
+        'Scottish Championship': 0.65,
+        'Scottish League One': 0.6,
+        'Scottish League Two': 0.55,
+        'National League': 0.6
+    }
+    win_rates = {
+        'Championship': 0.65,
+        'League One': 0.60,
+        'League Two': 0.55,
+        'Scottish Premiership': 0.62,
+        'Scottish Championship': 0.58,
+        'Scottish League One': 0.55,
+        'Scottish League Two': 0.52,
+        'National League': 0.57
+    }
+    lay_stake = 100.0
+    commission_rate = 0.02
+    
+    # Add Premier League results (these are the real ones), reshaped column-wise
+    home = pl_results['Home Team'].astype(str)
+    away = pl_results['Away Team'].astype(str)
+    pl_frame = pl_results.rename(columns={
+        'Home Team': 'Home_Team',
+        'Away Team': 'Away_Team',
+        'Under 0.5 Goals Odds': 'Under_Odds',
+        'Model Result': 'Model_Result'
+    }).assign(
+        League='Premier League',
+        Event_ID='PL_' + pl_results['Date'].astype(str) + '_' + home + '_' + away,
+        Event_Name=home + ' v ' + away
+    )[list(RESULT_COLUMNS)]
     
     # For other leagues, we'll create a much more conservative approach
     # Only include matches that would have qualified under the same criteria
     
+    # Preallocate the simulated numeric columns up to the per-league caps;
+    # odds are held as float32 to halve their bytes, money stays float64
+    total_cap = sum(max_bets_per_league.get(league, 10) for league in leagues_matches if league != 'Premier League')
+    sim_odds = np.empty(total_cap, dtype=np.float32)
+    sim_profit = np.empty(total_cap)
+    sim_win = np.empty(total_cap, dtype=np.bool_)
+    sim_leagues = []
+    sim_matches = []
+    k = 0
+    
     for league, matches in leagues_matches.items():
         if league == 'Premier League':
             continue  # Already processed
@@ -209,103 +368,60 @@ def apply_exact_same_formula(leagues_matches, pl_reference):
         
         # Filter matches to only include those that would qualify
         # Using the same date range as Premier League (matchweek 5 onwards)
-        qualifying_matches = []
-        
-        for match in matches:
-            match_date = datetime.strptime(match['date'], '%Y-%m-%d')
-            # Only include matches from September 2024 onwards (matchweek 5+)
-            if match_date >= datetime(2024, 9, 1):
-                qualifying_matches.append(match)
+        # Only include matches from September 2024 onwards (matchweek 5+);
+        # ISO dates compare correctly as plain strings
+        qualifying_matches = [match for match in matches if match['date'] >= QUALIFYING_FROM]
         
         print(f"   Qualifying matches (Sep 2024+): {len(qualifying_matches)}")
         
         # Apply the same conservative approach as Premier League
         # Only include a small subset that would meet the criteria
-        league_bets = 0
-        max_bets_per_league = {
-            'Championship': 50,  # Much fewer than Premier League
-            'League One': 30,
-            'League Two': 20,
-            'Scottish Premiership': 25,
-            'Scottish Championship': 10,
-            'Scottish League One': 8,
-            'Scottish League Two': 5,
-            'National League': 15
-        }
-        
         max_bets = max_bets_per_league.get(league, 10)
+        candidates = qualifying_matches[:max_bets]  # Limit to reasonable number
+        n = len(candidates)
         
-        for match in qualifying_matches[:max_bets]:  # Limit to reasonable number
-            # Use the same odds range as Premier League
-            under_odds = np.random.uniform(3.0, 5.0)  # Same range as PL
-            
-            # Apply the same formula: combined average >= 1.5
-            # For other leagues, we'll be more conservative
-            league_multipliers = {
-                'Championship': 0.8,
-                'League One': 0.7,
-                'League Two': 0.6,
-                'Scottish Premiership': 0.75,
-                'Scottish Championship': 0.65,
-                'Scottish League One': 0.6,
-                'Scottish League Two': 0.55,
-                'National League': 0.6
-            }
-            
-            multiplier = league_multipliers.get(league, 0.5)
-            combined_average = np.random.uniform(1.2, 2.0) * multiplier
-            
-            # Only bet if combined average >= 1.5 (same as Premier League)
-            if combined_average >= 1.5:
-                # Simulate result based on league quality
-                win_rates = {
-                    'Championship': 0.65,
-                    'League One': 0.60,
-                    'League Two': 0.55,
-                    'Scottish Premiership': 0.62,
-                    'Scottish Championship': 0.58,
-                    'Scottish League One': 0.55,
-                    'Scottish League Two': 0.52,
-                    'National League': 0.57
-                }
-                
-                win_rate = win_rates.get(league, 0.5)
-                is_win = np.random.random() < win_rate
-                
-                # Calculate PnL using same lay betting formula
-                lay_stake = 100.0
-                commission_rate = 0.02
-                
-                if is_win:
-                    profit = lay_stake * (1 - commission_rate)
-                    bet_result = 'WIN'
-                    model_result = 'WIN'
-                else:
-                    loss_amount = lay_stake * (under_odds - 1)
-                    profit = -loss_amount
-                    bet_result = 'LOSS'
-                    model_result = 'LOSS'
-                
-                all_results.append({
-                    'League': league,
-                    'Date': match['date'],
-                    'Home_Team': match['home_team'],
-                    'Away_Team': match['away_team'],
-                    'Event_ID': match['event_id'],
-                    'Event_Name': match['event_name'],
-                    'Under_Odds': round(under_odds, 2),
-                    'Lay_Stake': lay_stake,
-                    'Model_Result': model_result,
-                    'Bet_Result': bet_result,
-                    'Profit_Loss': round(profit, 2),
-                    'Cumulative_PnL': 0  # Will be calculated later
-                })
-                
-                league_bets += 1
+        # Draw every match's odds, combined average and result in one batch
+        under_odds = _RNG.uniform(3.0, 5.0, n)  # Same range as PL
+        base_average = _RNG.uniform(1.2, 2.0, n)
+        win_draws = _RNG.random(n)
+        
+        # Apply the same formula: combined average >= 1.5
+        # For other leagues, we'll be more conservative
+        multiplier = league_multipliers.get(league, 0.5)
+        win_rate = win_rates.get(league, 0.5)
+        bet_mask, is_win, profit = _simulate(
+            under_odds, base_average, multiplier, win_draws, win_rate, lay_stake, commission_rate
+        )
+        
+        league_bets = int(bet_mask.sum())
+        sim_odds[k:k + league_bets] = np.round(under_odds[bet_mask], 2)
+        sim_profit[k:k + league_bets] = np.round(profit[bet_mask], 2)
+        sim_win[k:k + league_bets] = is_win[bet_mask]
+        sim_leagues.extend([league] * league_bets)
+        sim_matches.extend(match for match, keep in zip(candidates, bet_mask) if keep)
+        k += league_bets
         
         print(f"   Generated {league_bets} bets for {league}")
     
-    return all_results
+    outcome = np.where(sim_win[:k], 'WIN', 'LOSS')
+    simulated = pd.DataFrame({
+        'League': sim_leagues,
+        'Date': [match['date'] for match in sim_matches],
+        'Home_Team': [match['home_team'] for match in sim_matches],
+        'Away_Team': [match['away_team'] for match in sim_matches],
+        'Event_ID': [match['event_id'] for match in sim_matches],
+        'Event_Name': [match['event_name'] for match in sim_matches],
+        'Under_Odds': sim_odds[:k],
+        'Lay_Stake': np.full(k, lay_stake),
+        'Model_Result': outcome,
+        'Bet_Result': outcome,
+        'Profit_Loss': sim_profit[:k],
+        'Cumulative_PnL': np.zeros(k)  # Will be calculated later
+    })
+    
+    # Match the PL reference odds to the float32 layout so concat does not upcast them
+    pl_frame = pl_frame.astype(dict.fromkeys(FLOAT32_COLUMNS, np.float32))
+    return pd.concat([pl_frame, simulated], ignore_index=True)
 
 def main():
     """Main function for corrected comprehensive analysis."""
@@ -331,18 +447,17 @@ def main():
     for league, matches in leagues_matches.items():
         print(f"   {league}: {len(matches)} matches")
     
-    # Apply exact same formula
-    all_results = apply_exact_same_formula(leagues_matches, pl_reference)
-    
     # Create comprehensive DataFrame
-    df = pd.DataFrame(all_results)
+    df = apply_exact_same_formula(leagues_matches, pl_reference)
     
     if len(df) > 0:
         # Sort by league and date
         df = df.sort_values(['League', 'Date'])
         
-        # Calculate cumulative PnL by league
-        df['Cumulative_PnL'] = df.groupby('League')['Profit_Loss'].cumsum()
+        # Calculate cumulative PnL by league; group on categorical codes,
+        # the rows are already contiguous per league after the sort
+        league_key = df['League'].astype('category')
+        df['Cumulative_PnL'] = df.groupby(league_key, sort=False, observed=True)['Profit_Loss'].cumsum()
         
         # Save results
         df.to_csv('corrected_comprehensive_all_leagues_analysis.csv', index=False)
@@ -352,12 +467,19 @@ def main():
         print(f"Total bets analyzed: {len(df)}")
         
         # Summary by league
-        league_summary = df.groupby('League').agg({
-            'Profit_Loss': ['count', 'sum', 'mean'],
-            'Bet_Result': lambda x: (x == 'WIN').sum()
-        }).round(2)
+        # Rows are sorted by league, so each league is one contiguous run
+        leagues = df['League'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, leagues[1:] != leagues[:-1]])
+        total_bets = np.diff(np.r_[starts, len(df)])
+        total_pnl = np.add.reduceat(df['Profit_Loss'].to_numpy(dtype=float), starts)
+        winning_bets = np.add.reduceat((df['Bet_Result'].to_numpy() == 'WIN').astype(np.int64), starts)
         
-        league_summary.columns = ['Total_Bets', 'Total_PnL', 'Avg_PnL', 'Winning_Bets']
+        league_summary = pd.DataFrame({
+            'Total_Bets': total_bets,
+            'Total_PnL': total_pnl.round(2),
+            'Avg_PnL': (total_pnl / total_bets).round(2),
+            'Winning_Bets': winning_bets
+        }, index=pd.Index(leagues[starts], name='League'))
         league_summary['Win_Rate'] = (league_summary['Winning_Bets'] / league_summary['Total_Bets'] * 100).round(1)
         league_summary['Cumulative_PnL'] = league_summary['Total_PnL'].cumsum()
         
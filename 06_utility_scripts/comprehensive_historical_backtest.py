@@ -5,22 +5,53 @@ Analyzes all leagues to find which ones our model works best for
 """
 
 import asyncio
+import heapq
 import yaml
 import requests
+import ijson
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
-import json
-import math
-import random
+import numpy as np
+import orjson
+import re
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 import os
 from collections import defaultdict
+from operator import itemgetter
+
+def _empty_league_summary(league_name: str, country: str) -> Dict[str, Any]:
+    """League summary for a league with no usable fixtures."""
+    return {
+        'league_name': league_name,
+        'country': country,
+        'total_matches': 0,
+        'bets_placed': 0,
+        'correct_predictions': 0,
+        'accuracy': 0,
+        'total_pnl': 0,
+        'roi': 0,
+        'matches': pd.DataFrame()
+    }
+
+def _backtest_worker(task: Tuple[pd.DataFrame, str, str, Dict, np.random.Generator]) -> Dict[str, Any]:
+    """Process pool entry point: backtest one league without sharing the backtester."""
+    fixtures_df, league_name, country, tier_info, rng = task
+    try:
+        return ComprehensiveHistoricalBacktester.backtest_league(fixtures_df, league_name, country, tier_info, rng)
+    except Exception as e:
+        print(f"❌ Error backtesting {league_name}: {e}")
+        return _empty_league_summary(league_name, country)
 
 class ComprehensiveHistoricalBacktester:
     """Comprehensive backtesting system for all leagues in 2024-2025 season."""
     
+    __slots__ = (
+        'api_key', 'base_url', 'headers', 'all_leagues', 'league_tiers',
+        'request_delay', 'rng', 'all_results', 'league_performance', 'team_performance'
+    )
+    
     def __init__(self):
         self.api_key = self._get_api_key()
         self.base_url = "https://v3.football.api-sports.io"
@@ -35,6 +66,9 @@ class ComprehensiveHistoricalBacktester:
         # Rate limiting
         self.request_delay = 0.2  # 200ms between requests
         
+        # Seeded generator for simulated market odds (reproducible runs)
+        self.rng = np.random.default_rng(42)
+        
         # Results storage
         self.all_results = []
         self.league_performance = {}
@@ -80,32 +114,25 @@ class ComprehensiveHistoricalBacktester:
             'Amateur', 'Youth', 'U20', 'U19', 'U18'
         ]
         
-        tiers = {}
+        if self.all_leagues.empty:
+            return {}
         
-        for _, league in self.all_leagues.iterrows():
-            league_name = league['League_Name']
-            country = league['Country']
-            
-            if any(t1 in league_name for t1 in tier_1_leagues):
-                tier = 1
-                min_avg, max_avg = 1.2, 1.8
-            elif any(t2 in league_name for t2 in tier_2_leagues):
-                tier = 2
-                min_avg, max_avg = 1.0, 1.6
-            elif any(t3 in league_name for t3 in tier_3_leagues):
-                tier = 3
-                min_avg, max_avg = 0.8, 1.4
-            elif any(t4 in league_name for t4 in tier_4_leagues):
-                tier = 4
-                min_avg, max_avg = 0.6, 1.2
-            else:
-                if country in ['England', 'Spain', 'Germany', 'Italy', 'France']:
-                    tier = 2
-                    min_avg, max_avg = 1.0, 1.6
-                else:
-                    tier = 3
-                    min_avg, max_avg = 0.8, 1.4
-            
+        names = self.all_leagues['League_Name']
+        countries = self.all_leagues['Country']
+        
+        # First matching tier wins; unmatched leagues fall back on country
+        conditions = [
+            names.str.contains('|'.join(map(re.escape, tier_leagues)), na=False).to_numpy()
+            for tier_leagues in (tier_1_leagues, tier_2_leagues, tier_3_leagues, tier_4_leagues)
+        ]
+        major_country = countries.isin(['England', 'Spain', 'Germany', 'Italy', 'France']).to_numpy()
+        league_tiers = np.select(conditions, [1, 2, 3, 4], default=np.where(major_country, 2, 3))
+        
+        tier_ranges = {1: (1.2, 1.8), 2: (1.0, 1.6), 3: (0.8, 1.4), 4: (0.6, 1.2)}
+        
+        tiers = {}
+        for league_name, country, tier in zip(names.to_numpy(), countries.to_numpy(), league_tiers.tolist()):
+            min_avg, max_avg = tier_ranges[tier]
             tiers[league_name] = {
                 'tier': tier,
                 'min_avg': min_avg,
@@ -115,12 +142,12 @@ class ComprehensiveHistoricalBacktester:
         
         return tiers
     
-    def calculate_team_averages(self, home_team: str, away_team: str, league_name: str, 
+    @staticmethod
+    def calculate_team_averages(home_team: str, away_team: str, tier_info: Dict, 
                               historical_matches: List[Dict]) -> Tuple[float, float]:
         """Calculate team averages based on historical matches."""
         
-        # Get league tier for realistic ranges
-        tier_info = self.league_tiers.get(league_name, {'tier': 3, 'min_avg': 0.8, 'max_avg': 1.4})
+        # League tier gives realistic ranges
         min_avg, max_avg = tier_info['min_avg'], tier_info['max_avg']
         
         # Calculate home team average from historical matches
@@ -141,34 +168,35 @@ class ComprehensiveHistoricalBacktester:
             away_factor = hash(away_team) % 100 / 100.0
             away_avg = min_avg + (max_avg - min_avg) * (0.3 + 0.7 * away_factor)
         
-        return round(home_avg, 2), round(away_avg, 2)
+        return home_avg, away_avg
     
-    def calculate_projection(self, home_avg: float, away_avg: float) -> Dict[str, float]:
-        """Calculate First-Half Over 0.5 projection."""
+    @staticmethod
+    def calculate_projection(home_avg: np.ndarray, away_avg: np.ndarray,
+                             market_noise: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculate First-Half Over 0.5 projections for arrays of fixtures."""
         
         combined_avg = (home_avg + away_avg) / 2
-        p_over_05 = 1 - math.exp(-combined_avg)
-        fair_odds = 1 / p_over_05 if p_over_05 > 0 else 10.0
+        p_over_05 = 1 - np.exp(-combined_avg)
+        fair_odds = np.divide(1, p_over_05, out=np.full_like(p_over_05, 10.0), where=p_over_05 > 0)
         
         # Simulate market odds with realistic spread
-        market_odds = fair_odds * random.uniform(0.85, 1.15)
+        market_odds = fair_odds * market_noise
         edge_pct = (market_odds / fair_odds - 1) * 100
         
         return {
-            'combined_avg': round(combined_avg, 2),
-            'p_over_05': round(p_over_05, 3),
-            'fair_odds': round(fair_odds, 2),
-            'market_odds': round(market_odds, 2),
-            'edge_pct': round(edge_pct, 1)
+            'combined_avg': combined_avg,
+            'p_over_05': p_over_05,
+            'fair_odds': fair_odds,
+            'market_odds': market_odds,
+            'edge_pct': edge_pct
         }
     
-    def calculate_pnl(self, outcome: str, market_odds: float, stake: float = 100.0) -> float:
+    @staticmethod
+    def calculate_pnl(goal_scored: np.ndarray, market_odds: np.ndarray, stake: float = 100.0) -> np.ndarray:
         """Calculate PnL for lay betting (laying Under 0.5 Goals)."""
         
-        if outcome == 'WIN':  # Goal scored before half-time
-            return stake * 0.98
-        else:  # 0-0 at half-time
-            return -stake * (market_odds - 1)
+        # Goal scored before half-time wins the stake less commission; 0-0 pays the liability
+        return np.where(goal_scored, stake * 0.98, -stake * (market_odds - 1))
     
     async def fetch_league_fixtures_historical(self, league_id: int, season: str = "2024") -> List[Dict]:
         """Fetch historical fixtures and results for a league."""
@@ -177,129 +205,122 @@ class ComprehensiveHistoricalBacktester:
             return []
         
         try:
-            response = requests.get(f"{self.base_url}/fixtures", 
-                                  headers=self.headers, 
-                                  params={
-                                      'league': league_id,
-                                      'season': season,
-                                      'status': 'FT'  # Only finished matches
-                                  })
-            response.raise_for_status()
-            
-            data = response.json()
-            fixtures = data.get('response', [])
-            
-            processed_fixtures = []
-            for fixture in fixtures:
-                # Extract first-half scores
-                home_ht = fixture['score']['halftime']['home']
-                away_ht = fixture['score']['halftime']['away']
+            with requests.get(f"{self.base_url}/fixtures", 
+                              headers=self.headers, 
+                              params={
+                                  'league': league_id,
+                                  'season': season,
+                                  'status': 'FT'  # Only finished matches
+                              },
+                              stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
                 
-                # Calculate first-half total goals
-                first_half_goals = home_ht + away_ht
+                # Stream fixtures one at a time instead of materializing the whole payload
+                processed_fixtures = []
+                for fixture in ijson.items(response.raw, 'response.item'):
+                    # Extract first-half scores
+                    home_ht = fixture['score']['halftime']['home']
+                    away_ht = fixture['score']['halftime']['away']
+                    
+                    # Skip fixtures without a recorded half-time score
+                    if home_ht is None or away_ht is None:
+                        continue
+                    
+                    # Calculate first-half total goals
+                    first_half_goals = home_ht + away_ht
+                    
+                    processed_fixtures.append({
+                        'fixture_id': fixture['fixture']['id'],
+                        'league_id': league_id,
+                        'league_name': fixture['league']['name'],
+                        'country': fixture['league']['country'],
+                        'home_team': fixture['teams']['home']['name'],
+                        'away_team': fixture['teams']['away']['name'],
+                        'match_date': fixture['fixture']['date'],
+                        'home_first_half_goals': home_ht,
+                        'away_first_half_goals': away_ht,
+                        'total_first_half_goals': first_half_goals,
+                        'outcome': 'WIN' if first_half_goals > 0 else 'LOSS'
+                    })
                 
-                processed_fixtures.append({
-                    'fixture_id': fixture['fixture']['id'],
-                    'league_id': league_id,
-                    'league_name': fixture['league']['name'],
-                    'country': fixture['league']['country'],
-                    'home_team': fixture['teams']['home']['name'],
-                    'away_team': fixture['teams']['away']['name'],
-                    'match_date': fixture['fixture']['date'],
-                    'home_first_half_goals': home_ht,
-                    'away_first_half_goals': away_ht,
-                    'total_first_half_goals': first_half_goals,
-                    'outcome': 'WIN' if first_half_goals > 0 else 'LOSS'
-                })
-            
             return processed_fixtures
             
         except Exception as e:
             print(f"❌ Error fetching historical fixtures for league {league_id}: {e}")
             return []
     
-    async def backtest_league(self, league_id: int, league_name: str, country: str) -> Dict[str, Any]:
-        """Backtest a single league for the 2024-2025 season."""
-        
-        print(f"🔍 Backtesting {league_name} ({country})...", end=" ")
-        
-        # Fetch historical fixtures
-        fixtures = await self.fetch_league_fixtures_historical(league_id, "2024")
-        
-        if not fixtures:
-            print("❌ No data")
-            return {
-                'league_name': league_name,
-                'country': country,
-                'total_matches': 0,
-                'bets_placed': 0,
-                'correct_predictions': 0,
-                'accuracy': 0,
-                'total_pnl': 0,
-                'roi': 0,
-                'matches': []
-            }
-        
-        # Sort fixtures by date for chronological processing
-        fixtures.sort(key=lambda x: x['match_date'])
-        
-        # Process each match chronologically
-        league_results = []
+    @staticmethod
+    def backtest_league(fixtures_df: pd.DataFrame, league_name: str, country: str,
+                        tier_info: Dict, rng: np.random.Generator) -> Dict[str, Any]:
+        """Backtest a single league for the 2024-2025 season from its fetched fixtures."""
+        
+        if fixtures_df.empty:
+            return _empty_league_summary(league_name, country)
+        
+        # Sort fixtures by kickoff time for chronological processing
+        fixtures_df = fixtures_df.assign(match_date=pd.to_datetime(fixtures_df['match_date'], utc=True))
+        fixtures_df = fixtures_df.sort_values('match_date', kind='stable').reset_index(drop=True)
+        fixtures = fixtures_df.to_dict('records')
+        
+        # Market odds spread for the whole league in one draw
+        n = len(fixtures)
+        market_noise = rng.uniform(0.85, 1.15, size=n)
+        
+        # Team averages depend on earlier results, so they are built chronologically
+        home_avgs = np.empty(n)
+        away_avgs = np.empty(n)
         historical_matches = []  # Store for team average calculation
         
         for i, fixture in enumerate(fixtures):
-            # Calculate team averages based on historical matches up to this point
-            home_avg, away_avg = self.calculate_team_averages(
+            home_avgs[i], away_avgs[i] = ComprehensiveHistoricalBacktester.calculate_team_averages(
                 fixture['home_team'], 
                 fixture['away_team'], 
-                league_name,
+                tier_info,
                 historical_matches
             )
             
-            # Calculate projection
-            projection = self.calculate_projection(home_avg, away_avg)
-            
-            # Apply betting criteria (combined average >= 1.5)
-            if projection['combined_avg'] >= 1.5:
-                # Calculate PnL based on actual outcome
-                pnl = self.calculate_pnl(fixture['outcome'], projection['market_odds'])
-                
-                result = {
-                    'fixture_id': fixture['fixture_id'],
-                    'league_name': league_name,
-                    'country': country,
-                    'home_team': fixture['home_team'],
-                    'away_team': fixture['away_team'],
-                    'match_date': fixture['match_date'],
-                    'home_avg': home_avg,
-                    'away_avg': away_avg,
-                    'combined_avg': projection['combined_avg'],
-                    'p_over_05': projection['p_over_05'],
-                    'fair_odds': projection['fair_odds'],
-                    'market_odds': projection['market_odds'],
-                    'edge_pct': projection['edge_pct'],
-                    'actual_outcome': fixture['outcome'],
-                    'actual_first_half_goals': fixture['total_first_half_goals'],
-                    'prediction_correct': projection['combined_avg'] >= 1.5 and fixture['outcome'] == 'WIN',
-                    'pnl': round(pnl, 2),
-                    'stake': 100.0
-                }
-                
-                league_results.append(result)
-            
             # Add this match to historical data for future calculations
             historical_matches.append(fixture)
         
+        # Project every fixture at once, then keep only the bets (combined average >= 1.5)
+        projection = ComprehensiveHistoricalBacktester.calculate_projection(home_avgs, away_avgs, market_noise)
+        mask = projection['combined_avg'] >= 1.5
+        
+        bets = fixtures_df.loc[mask].reset_index(drop=True)
+        goal_scored = bets['outcome'].to_numpy() == 'WIN'
+        bet_market_odds = projection['market_odds'][mask]
+        
+        league_results = pd.DataFrame({
+            'fixture_id': bets['fixture_id'],
+            'league_name': league_name,
+            'country': country,
+            'home_team': bets['home_team'],
+            'away_team': bets['away_team'],
+            'match_date': bets['match_date'],
+            'home_avg': home_avgs[mask],
+            'away_avg': away_avgs[mask],
+            'combined_avg': projection['combined_avg'][mask],
+            'p_over_05': projection['p_over_05'][mask],
+            'fair_odds': projection['fair_odds'][mask],
+            'market_odds': bet_market_odds,
+            'edge_pct': projection['edge_pct'][mask],
+            'actual_outcome': bets['outcome'],
+            'actual_first_half_goals': bets['total_first_half_goals'],
+            'prediction_correct': goal_scored,
+            'pnl': ComprehensiveHistoricalBacktester.calculate_pnl(goal_scored, bet_market_odds),
+            'stake': 100.0
+        })
+        
         # Calculate league performance
-        total_matches = len(fixtures)
+        total_matches = n
         bets_placed = len(league_results)
-        correct_predictions = sum(1 for r in league_results if r['prediction_correct'])
+        totals = league_results[['pnl', 'prediction_correct']].sum()
+        correct_predictions = int(totals['prediction_correct'])
         accuracy = correct_predictions / bets_placed if bets_placed > 0 else 0
-        total_pnl = sum(r['pnl'] for r in league_results)
+        total_pnl = float(totals['pnl'])
         roi = total_pnl / (bets_placed * 100) * 100 if bets_placed > 0 else 0
         
-        print(f"✅ {bets_placed}/{total_matches} bets, {accuracy:.1%} accuracy, ${total_pnl:.2f} PnL")
-        
         return {
             'league_name': league_name,
             'country': country,
@@ -324,54 +345,54 @@ class ComprehensiveHistoricalBacktester:
         # Select leagues to backtest
         leagues_to_test = self.all_leagues.head(max_leagues)
         
-        all_results = []
-        league_summaries = []
-        
-        for i, (_, league) in enumerate(leagues_to_test.iterrows(), 1):
-            league_id = league['League_ID']
-            league_name = league['League_Name']
-            country = league['Country']
+        # Fetch every league first; the network phase stays on the event loop
+        default_tier = {'tier': 3, 'min_avg': 0.8, 'max_avg': 1.4}
+        league_rngs = self.rng.spawn(len(leagues_to_test))
+        tasks = []
+        for i, league in enumerate(leagues_to_test.itertuples(index=False), 1):
+            league_id = league.League_ID
+            league_name = league.League_Name
+            country = league.Country
             
-            print(f"[{i}/{len(leagues_to_test)}] ", end="")
+            print(f"[{i}/{len(leagues_to_test)}] 🔍 Fetching {league_name} ({country})...")
             
-            try:
-                result = await self.backtest_league(league_id, league_name, country)
-                league_summaries.append(result)
-                
-                # Store individual match results
-                for match in result['matches']:
-                    all_results.append(match)
-                
-                # Rate limiting
-                await asyncio.sleep(self.request_delay)
-                
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                league_summaries.append({
-                    'league_name': league_name,
-                    'country': country,
-                    'total_matches': 0,
-                    'bets_placed': 0,
-                    'correct_predictions': 0,
-                    'accuracy': 0,
-                    'total_pnl': 0,
-                    'roi': 0,
-                    'matches': []
-                })
-        
-        # Calculate overall statistics
-        total_matches = sum(r['total_matches'] for r in league_summaries)
-        total_bets = sum(r['bets_placed'] for r in league_summaries)
-        total_correct = sum(r['correct_predictions'] for r in league_summaries)
+            fixtures = await self.fetch_league_fixtures_historical(league_id, "2024")
+            tier_info = self.league_tiers.get(league_name, default_tier)
+            tasks.append((pd.DataFrame(fixtures), league_name, country, tier_info, league_rngs[i - 1]))
+            
+            # Rate limiting
+            await asyncio.sleep(self.request_delay)
+        
+        # Leagues are independent, so the CPU-bound backtests run across all cores
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            league_summaries = list(executor.map(_backtest_worker, tasks))
+        
+        for result in league_summaries:
+            if result['total_matches'] > 0:
+                print(f"✅ {result['league_name']}: {result['bets_placed']}/{result['total_matches']} bets, "
+                      f"{result['accuracy']:.1%} accuracy, ${result['total_pnl']:.2f} PnL")
+            else:
+                print(f"❌ {result['league_name']}: No data")
+        
+        # Individual match results as a single DataFrame
+        all_results = pd.concat([r['matches'] for r in league_summaries], ignore_index=True) if league_summaries else pd.DataFrame()
+        
+        # Calculate overall statistics in one pass over the league summaries
+        summary_df = pd.DataFrame(league_summaries, columns=['total_matches', 'bets_placed',
+                                                             'correct_predictions', 'total_pnl'])
+        totals = summary_df.sum()
+        total_matches = int(totals['total_matches'])
+        total_bets = int(totals['bets_placed'])
+        total_correct = int(totals['correct_predictions'])
         overall_accuracy = total_correct / total_bets if total_bets > 0 else 0
-        total_pnl = sum(r['total_pnl'] for r in league_summaries)
+        total_pnl = float(totals['total_pnl'])
         overall_roi = total_pnl / (total_bets * 100) * 100 if total_bets > 0 else 0
         
         return {
             'overall_stats': {
                 'leagues_tested': len(leagues_to_test),
-                'leagues_with_data': len([r for r in league_summaries if r['total_matches'] > 0]),
-                'leagues_with_bets': len([r for r in league_summaries if r['bets_placed'] > 0]),
+                'leagues_with_data': int((summary_df['total_matches'] > 0).sum()),
+                'leagues_with_bets': int((summary_df['bets_placed'] > 0).sum()),
                 'total_matches': total_matches,
                 'total_bets': total_bets,
                 'total_correct': total_correct,
@@ -401,67 +422,82 @@ class ComprehensiveHistoricalBacktester:
         print(f"Overall ROI: {overall['overall_roi']:.1f}%")
         
         # Top performing leagues
-        profitable_leagues = [l for l in league_summaries if l['bets_placed'] > 0 and l['total_pnl'] > 0]
-        profitable_leagues.sort(key=lambda x: x['total_pnl'], reverse=True)
+        profitable_leagues = heapq.nlargest(
+            20, (l for l in league_summaries if l['bets_placed'] > 0 and l['total_pnl'] > 0),
+            key=itemgetter('total_pnl'))
         
         print(f"\n🏆 TOP PERFORMING LEAGUES (by PnL)")
         print("=" * 70)
-        for i, league in enumerate(profitable_leagues[:20], 1):
+        for i, league in enumerate(profitable_leagues, 1):
             print(f"{i:2d}. {league['league_name']:25s} | {league['country']:12s} | "
                   f"{league['bets_placed']:3d} bets | {league['accuracy']:5.1%} | "
                   f"${league['total_pnl']:8.2f} | {league['roi']:6.1f}% ROI")
         
         # Most accurate leagues
-        accurate_leagues = [l for l in league_summaries if l['bets_placed'] >= 10]
-        accurate_leagues.sort(key=lambda x: x['accuracy'], reverse=True)
+        accurate_leagues = heapq.nlargest(
+            15, (l for l in league_summaries if l['bets_placed'] >= 10),
+            key=itemgetter('accuracy'))
         
         print(f"\n🎯 MOST ACCURATE LEAGUES (min 10 bets)")
         print("=" * 70)
-        for i, league in enumerate(accurate_leagues[:15], 1):
+        for i, league in enumerate(accurate_leagues, 1):
             print(f"{i:2d}. {league['league_name']:25s} | {league['country']:12s} | "
                   f"{league['bets_placed']:3d} bets | {league['accuracy']:5.1%} | "
                   f"${league['total_pnl']:8.2f} | {league['roi']:6.1f}% ROI")
         
         # Worst performing leagues
-        worst_leagues = [l for l in league_summaries if l['bets_placed'] > 0 and l['total_pnl'] < 0]
-        worst_leagues.sort(key=lambda x: x['total_pnl'])
+        worst_leagues = heapq.nsmallest(
+            10, (l for l in league_summaries if l['bets_placed'] > 0 and l['total_pnl'] < 0),
+            key=itemgetter('total_pnl'))
         
         print(f"\n⚠️  WORST PERFORMING LEAGUES (by PnL)")
         print("=" * 70)
-        for i, league in enumerate(worst_leagues[:10], 1):
+        for i, league in enumerate(worst_leagues, 1):
             print(f"{i:2d}. {league['league_name']:25s} | {league['country']:12s} | "
                   f"{league['bets_placed']:3d} bets | {league['accuracy']:5.1%} | "
                   f"${league['total_pnl']:8.2f} | {league['roi']:6.1f}% ROI")
     
-    def save_results(self, backtest_data: Dict[str, Any], filename_prefix: str = "comprehensive_backtest"):
-        """Save comprehensive backtesting results."""
+    def _write_table(self, df: pd.DataFrame, path_stem: str, csv: bool):
+        """Write a results table as zstd parquet, plus CSV when requested."""
+        
+        df.to_parquet(f"{path_stem}.parquet", compression='zstd', use_dictionary=True, index=False)
+        if csv:
+            df.to_csv(f"{path_stem}.csv", index=False)
+    
+    def save_results(self, backtest_data: Dict[str, Any], filename_prefix: str = "comprehensive_backtest",
+                     csv: bool = False):
+        """Save comprehensive backtesting results (parquet, with optional CSV copies)."""
         
         overall = backtest_data['overall_stats']
         league_summaries = backtest_data['league_summaries']
         all_results = backtest_data['all_results']
         
         # Save overall statistics
-        with open(f"{filename_prefix}_overall.json", 'w') as f:
-            json.dump(overall, f, indent=2)
+        with open(f"{filename_prefix}_overall.json", 'wb') as f:
+            f.write(orjson.dumps(overall, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         print(f"💾 Overall statistics saved to {filename_prefix}_overall.json")
         
         # Save league summaries
-        df_summaries = pd.DataFrame(league_summaries)
-        df_summaries.to_csv(f"{filename_prefix}_league_summary.csv", index=False)
-        print(f"💾 League summaries saved to {filename_prefix}_league_summary.csv")
+        df_summaries = pd.DataFrame(league_summaries).drop(columns='matches', errors='ignore')
+        self._write_table(df_summaries, f"{filename_prefix}_league_summary", csv)
+        print(f"💾 League summaries saved to {filename_prefix}_league_summary.parquet")
         
         # Save all individual results
-        if all_results:
-            df_results = pd.DataFrame(all_results)
-            df_results.to_csv(f"{filename_prefix}_all_results.csv", index=False)
-            print(f"💾 All individual results saved to {filename_prefix}_all_results.csv")
+        if not all_results.empty:
+            # Full precision is kept through the backtest; round once for output
+            df_results = all_results.round({
+                'home_avg': 2, 'away_avg': 2, 'combined_avg': 2, 'p_over_05': 3,
+                'fair_odds': 2, 'market_odds': 2, 'edge_pct': 1, 'pnl': 2
+            })
+            self._write_table(df_results, f"{filename_prefix}_all_results", csv)
+            print(f"💾 All individual results saved to {filename_prefix}_all_results.parquet")
             
             # Save top performing leagues
             profitable_leagues = [l for l in league_summaries if l['bets_placed'] > 0 and l['total_pnl'] > 0]
             profitable_leagues.sort(key=lambda x: x['total_pnl'], reverse=True)
-            df_profitable = pd.DataFrame(profitable_leagues)
-            df_profitable.to_csv(f"{filename_prefix}_profitable_leagues.csv", index=False)
-            print(f"💾 Profitable leagues saved to {filename_prefix}_profitable_leagues.csv")
+            df_profitable = pd.DataFrame(profitable_leagues).drop(columns='matches', errors='ignore')
+            self._write_table(df_profitable, f"{filename_prefix}_profitable_leagues", csv)
+            print(f"💾 Profitable leagues saved to {filename_prefix}_profitable_leagues.parquet")
 
 async def main():
     """Main function for comprehensive historical backtesting."""
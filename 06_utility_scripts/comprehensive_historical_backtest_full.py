@@ -5,19 +5,210 @@ Analyzes all 1,193 leagues in batches to find which ones our model works best fo
 """
 
 import asyncio
+import aiohttp
 import yaml
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
-import json
-import math
-import random
+import numpy as np
+from numba import njit
+import pyarrow as pa
+import pyarrow.parquet as pq
+import orjson
+import re
 import time
-from concurrent.futures import ThreadPoolExecutor
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 import os
 from collections import defaultdict
 
+# League name fragments per tier, highest tier first
+_TIER_LEAGUES = {
+    1: ['Premier League', 'La Liga', 'Bundesliga', 'Serie A', 'Ligue 1',
+        'Champions League', 'Europa League', 'UEFA Champions League'],
+    2: ['Championship', 'Segunda División', '2. Bundesliga', 'Serie B',
+        'Premiership', 'Jupiler Pro League', 'Eredivisie', 'Primeira Liga'],
+    3: ['League One', 'League Two', 'Serie C', '3. Liga',
+        'Championship', 'Liga 1', 'Segunda División B'],
+    4: ['League Two', 'Serie D', '4. Liga', 'Non League',
+        'Amateur', 'Youth', 'U20', 'U19', 'U18'],
+}
+
+_TIER_RANGES = {1: (1.2, 1.8), 2: (1.0, 1.6), 3: (0.8, 1.4), 4: (0.6, 1.2)}
+
+# One alternation of every fragment with a named group per tier. It sits in a
+# zero-width lookahead so finditer reports overlapping fragments too (e.g. the
+# tier-1 "Bundesliga" inside "2. Bundesliga"); at each position the lowest tier wins
+_TIER_PATTERN = re.compile('(?=' + '|'.join(
+    f"(?P<tier{tier}>{'|'.join(map(re.escape, names))})"
+    for tier, names in _TIER_LEAGUES.items()
+) + ')')
+
+def _match_tier(league_name: str) -> Optional[int]:
+    """Return the highest tier whose fragments appear in the league name, if any."""
+    return min((int(m.lastgroup[4:]) for m in _TIER_PATTERN.finditer(league_name)), default=None)
+
+# Fixed schemas for the streamed intermediate parquet files
+_SUMMARY_SCHEMA = pa.schema([
+    ('league_name', pa.string()), ('country', pa.string()),
+    ('total_matches', pa.int64()), ('bets_placed', pa.int64()),
+    ('correct_predictions', pa.int64()), ('accuracy', pa.float64()),
+    ('total_pnl', pa.float64()), ('roi', pa.float64()),
+])
+
+_RESULT_SCHEMA = pa.schema([
+    ('fixture_id', pa.int64()), ('league_name', pa.string()), ('country', pa.string()),
+    ('home_team', pa.string()), ('away_team', pa.string()), ('match_date', pa.string()),
+    ('home_avg', pa.float64()), ('away_avg', pa.float64()), ('combined_avg', pa.float64()),
+    ('p_over_05', pa.float64()), ('fair_odds', pa.float64()), ('market_odds', pa.float64()),
+    ('edge_pct', pa.float64()), ('actual_outcome', pa.string()),
+    ('actual_first_half_goals', pa.int64()), ('prediction_correct', pa.bool_()),
+    ('pnl', pa.float64()), ('stake', pa.float64()),
+])
+
+# Leagues up to this many fixtures use the Numba running-average kernel
+_NUMBA_MAX_FIXTURES = 500
+
+@njit(cache=True)
+def _running_team_avgs(home_idx: np.ndarray, away_idx: np.ndarray, home_goals: np.ndarray,
+                       away_goals: np.ndarray, n_teams: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-fixture home/away averages over each team's earlier matches, in one pass."""
+    
+    n = home_idx.shape[0]
+    home_avg = np.empty(n)
+    away_avg = np.empty(n)
+    home_sum = np.zeros(n_teams)
+    home_count = np.zeros(n_teams, np.int64)
+    away_sum = np.zeros(n_teams)
+    away_count = np.zeros(n_teams, np.int64)
+    
+    for i in range(n):
+        h = home_idx[i]
+        a = away_idx[i]
+        home_avg[i] = home_sum[h] / home_count[h] if home_count[h] > 0 else np.nan
+        away_avg[i] = away_sum[a] / away_count[a] if away_count[a] > 0 else np.nan
+        home_sum[h] += home_goals[i]
+        home_count[h] += 1
+        away_sum[a] += away_goals[i]
+        away_count[a] += 1
+    
+    return home_avg, away_avg
+
+# Per-process table of team fallback variation in [0, 1), filled as teams are first seen
+_TEAM_FACTOR: Dict[str, float] = {}
+
+def _team_factors(teams: pd.Series) -> pd.Series:
+    """Look up each team's fallback variation factor, computing it once per new team."""
+    
+    for team in teams.unique():
+        if team not in _TEAM_FACTOR:
+            # crc32 rather than hash() so factors are stable across runs (PYTHONHASHSEED)
+            _TEAM_FACTOR[team] = zlib.crc32(team.encode('utf-8')) % 100 / 100.0
+    
+    return teams.map(_TEAM_FACTOR)
+
+def _py_round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Round like Python's round(): correctly rounded from the exact binary value.
+    
+    np.round scales by 10**ndigits first, which can flip near-half ties (1.495 -> 1.5);
+    only those few elements are re-rounded in Python.
+    """
+    
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, ndigits) for value in values[near_tie].tolist()]
+    return rounded
+
+def _empty_league_summary(league_name: str, country: str) -> Dict[str, Any]:
+    """League summary for a league with no usable fixtures."""
+    return {
+        'league_name': league_name,
+        'country': country,
+        'total_matches': 0,
+        'bets_placed': 0,
+        'correct_predictions': 0,
+        'accuracy': 0,
+        'total_pnl': 0,
+        'roi': 0,
+        'matches': pd.DataFrame()
+    }
+
+def _backtest_league_pure(fixtures: List[Dict], league_name: str, country: str,
+                          tier_info: Dict, rng: np.random.Generator) -> Dict[str, Any]:
+    """Backtest one league from its fetched fixtures.
+    
+    Pure CPU work with no reference to the backtester, so it can run in a worker process.
+    """
+    
+    if not fixtures:
+        return _empty_league_summary(league_name, country)
+    
+    backtester = ComprehensiveHistoricalBacktesterFull
+    
+    # Sort fixtures by date for chronological processing
+    df = pd.DataFrame(fixtures).sort_values('match_date', kind='stable').reset_index(drop=True)
+    
+    # Team averages for every fixture in one vectorized pass; the tier range is constant for the league
+    min_avg, max_avg = tier_info['min_avg'], tier_info['max_avg']
+    home_avg, away_avg = backtester.calculate_team_averages(df, min_avg, max_avg)
+    
+    # Apply betting criteria (combined average >= 1.5) before the projection math,
+    # so exp/jitter/PnL are only evaluated for fixtures that become bets; the average
+    # is rounded exactly as round() did, since np.round flips some 1.495 ties
+    bet_mask = _py_round((home_avg + away_avg) / 2, 2) >= 1.5
+    bets = df[bet_mask].reset_index(drop=True)
+    home_avg, away_avg = home_avg[bet_mask], away_avg[bet_mask]
+    
+    market_noise = rng.uniform(0.85, 1.15, size=len(bets))
+    projection = backtester.calculate_projection(home_avg, away_avg, market_noise)
+    outcome = bets['outcome'].to_numpy()
+    pnl = backtester.calculate_pnl(outcome, projection['market_odds'])
+    
+    # Bets stay columnar
+    league_results = pd.DataFrame({
+        'fixture_id': bets['fixture_id'],
+        'league_name': league_name,
+        'country': country,
+        'home_team': bets['home_team'],
+        'away_team': bets['away_team'],
+        'match_date': bets['match_date'],
+        'home_avg': home_avg,
+        'away_avg': away_avg,
+        'combined_avg': projection['combined_avg'],
+        'p_over_05': projection['p_over_05'],
+        'fair_odds': projection['fair_odds'],
+        'market_odds': projection['market_odds'],
+        'edge_pct': projection['edge_pct'],
+        'actual_outcome': outcome,
+        'actual_first_half_goals': bets['total_first_half_goals'],
+        'prediction_correct': outcome == 'WIN',
+        'pnl': np.round(pnl, 2),
+        'stake': 100.0
+    })
+    
+    # Calculate league performance
+    total_matches = len(fixtures)
+    bets_placed = len(league_results)
+    correct_predictions = int(league_results['prediction_correct'].sum())
+    accuracy = correct_predictions / bets_placed if bets_placed > 0 else 0
+    total_pnl = float(league_results['pnl'].sum())
+    roi = total_pnl / (bets_placed * 100) * 100 if bets_placed > 0 else 0
+    
+    return {
+        'league_name': league_name,
+        'country': country,
+        'total_matches': total_matches,
+        'bets_placed': bets_placed,
+        'correct_predictions': correct_predictions,
+        'accuracy': round(accuracy, 3),
+        'total_pnl': round(total_pnl, 2),
+        'roi': round(roi, 1),
+        'matches': league_results
+    }
+
 class ComprehensiveHistoricalBacktesterFull:
     """Comprehensive backtesting system for ALL leagues in 2024-2025 season."""
     
@@ -32,8 +223,12 @@ class ComprehensiveHistoricalBacktesterFull:
         # League tier classification
         self.league_tiers = self._classify_leagues_by_tier()
         
-        # Rate limiting
-        self.request_delay = 0.1  # 100ms between requests for faster processing
+        # Seeded generator for simulated market odds (reproducible runs)
+        self.rng = np.random.default_rng(42)
+        
+        # Rate limiting: bound the number of in-flight API requests
+        self.max_concurrent_requests = 20
+        self.request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
         
         # Results storage
         self.all_results = []
@@ -44,6 +239,15 @@ class ComprehensiveHistoricalBacktesterFull:
         self.batch_size = 50
         self.total_batches = 0
         
+        # Finished seasons don't change, so fetched fixtures are cached on disk
+        self.fixture_cache_dir = os.path.join('cache', 'fixtures')
+        
+        # Intermediate results are appended to open parquet writers
+        self._summaries_writer = None
+        self._results_writer = None
+        self._last_saved_summaries = 0
+        self._last_saved_results = 0
+        
     def _get_api_key(self) -> str:
         """Get API key from config."""
         try:
@@ -56,7 +260,7 @@ class ComprehensiveHistoricalBacktesterFull:
     def _load_all_leagues(self) -> pd.DataFrame:
         """Load all available leagues from CSV."""
         try:
-            return pd.read_csv('api_football_all_leagues.csv')
+            return pd.read_csv('api_football_all_leagues.csv', engine='pyarrow')
         except:
             print("❌ Could not load leagues CSV")
             return pd.DataFrame()
@@ -64,51 +268,17 @@ class ComprehensiveHistoricalBacktesterFull:
     def _classify_leagues_by_tier(self) -> Dict[str, Dict]:
         """Classify leagues by tier for realistic projections."""
         
-        tier_1_leagues = [
-            'Premier League', 'La Liga', 'Bundesliga', 'Serie A', 'Ligue 1',
-            'Champions League', 'Europa League', 'UEFA Champions League'
-        ]
-        
-        tier_2_leagues = [
-            'Championship', 'Segunda División', '2. Bundesliga', 'Serie B',
-            'Premiership', 'Jupiler Pro League', 'Eredivisie', 'Primeira Liga'
-        ]
-        
-        tier_3_leagues = [
-            'League One', 'League Two', 'Serie C', '3. Liga',
-            'Championship', 'Liga 1', 'Segunda División B'
-        ]
-        
-        tier_4_leagues = [
-            'League Two', 'Serie D', '4. Liga', 'Non League',
-            'Amateur', 'Youth', 'U20', 'U19', 'U18'
-        ]
-        
         tiers = {}
         
-        for _, league in self.all_leagues.iterrows():
-            league_name = league['League_Name']
-            country = league['Country']
+        for league in self.all_leagues.itertuples(index=False):
+            league_name = league.League_Name
+            country = league.Country
             
-            if any(t1 in league_name for t1 in tier_1_leagues):
-                tier = 1
-                min_avg, max_avg = 1.2, 1.8
-            elif any(t2 in league_name for t2 in tier_2_leagues):
-                tier = 2
-                min_avg, max_avg = 1.0, 1.6
-            elif any(t3 in league_name for t3 in tier_3_leagues):
-                tier = 3
-                min_avg, max_avg = 0.8, 1.4
-            elif any(t4 in league_name for t4 in tier_4_leagues):
-                tier = 4
-                min_avg, max_avg = 0.6, 1.2
-            else:
-                if country in ['England', 'Spain', 'Germany', 'Italy', 'France']:
-                    tier = 2
-                    min_avg, max_avg = 1.0, 1.6
-                else:
-                    tier = 3
-                    min_avg, max_avg = 0.8, 1.4
+            # One pass over the name; the highest tier found decides ties between lists
+            tier = _match_tier(league_name)
+            if tier is None:
+                tier = 2 if country in ['England', 'Spain', 'Germany', 'Italy', 'France'] else 3
+            min_avg, max_avg = _TIER_RANGES[tier]
             
             tiers[league_name] = {
                 'tier': tier,
@@ -119,78 +289,100 @@ class ComprehensiveHistoricalBacktesterFull:
         
         return tiers
     
-    def calculate_team_averages(self, home_team: str, away_team: str, league_name: str, 
-                              historical_matches: List[Dict]) -> Tuple[float, float]:
-        """Calculate team averages based on historical matches."""
+    @staticmethod
+    def calculate_team_averages(fixtures_df: pd.DataFrame, min_avg: float,
+                                max_avg: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate each fixture's team averages from the matches played before it.
+        
+        fixtures_df must be in chronological order; min_avg/max_avg are the league tier's range.
+        """
+        
+        n = len(fixtures_df)
+        team_codes, teams = pd.factorize(pd.concat([fixtures_df['home_team'], fixtures_df['away_team']]))
+        home_idx, away_idx = team_codes[:n], team_codes[n:]
+        
+        # Running home/away averages over earlier matches (NaN before a team's first one)
+        if n <= _NUMBA_MAX_FIXTURES:
+            # Small leagues: a compiled loop beats the pandas groupby overhead
+            home_avg, away_avg = _running_team_avgs(
+                home_idx, away_idx,
+                fixtures_df['home_first_half_goals'].to_numpy(np.float64),
+                fixtures_df['away_first_half_goals'].to_numpy(np.float64),
+                len(teams)
+            )
+        else:
+            home_goals = fixtures_df.groupby('home_team', sort=False)['home_first_half_goals']
+            home_avg = ((home_goals.cumsum() - fixtures_df['home_first_half_goals']) / home_goals.cumcount()).to_numpy()
+            away_goals = fixtures_df.groupby('away_team', sort=False)['away_first_half_goals']
+            away_avg = ((away_goals.cumsum() - fixtures_df['away_first_half_goals']) / away_goals.cumcount()).to_numpy()
         
-        # Get league tier for realistic ranges
-        tier_info = self.league_tiers.get(league_name, {'tier': 3, 'min_avg': 0.8, 'max_avg': 1.4})
-        min_avg, max_avg = tier_info['min_avg'], tier_info['max_avg']
+        # Fallback to league tier average with team variation, computed once per team
+        team_fallback = min_avg + (max_avg - min_avg) * (0.3 + 0.7 * _team_factors(pd.Series(teams)).to_numpy())
         
-        # Calculate home team average from historical matches
-        home_matches = [m for m in historical_matches if m['home_team'] == home_team]
-        if home_matches:
-            home_avg = sum(m['home_first_half_goals'] for m in home_matches) / len(home_matches)
-        else:
-            # Fallback to league tier average with team variation
-            home_factor = hash(home_team) % 100 / 100.0
-            home_avg = min_avg + (max_avg - min_avg) * (0.3 + 0.7 * home_factor)
-        
-        # Calculate away team average from historical matches
-        away_matches = [m for m in historical_matches if m['away_team'] == away_team]
-        if away_matches:
-            away_avg = sum(m['away_first_half_goals'] for m in away_matches) / len(away_matches)
-        else:
-            # Fallback to league tier average with team variation
-            away_factor = hash(away_team) % 100 / 100.0
-            away_avg = min_avg + (max_avg - min_avg) * (0.3 + 0.7 * away_factor)
+        home_avg = np.where(np.isnan(home_avg), team_fallback[home_idx], home_avg)
+        away_avg = np.where(np.isnan(away_avg), team_fallback[away_idx], away_avg)
         
-        return round(home_avg, 2), round(away_avg, 2)
+        return _py_round(home_avg, 2), _py_round(away_avg, 2)
     
-    def calculate_projection(self, home_avg: float, away_avg: float) -> Dict[str, float]:
-        """Calculate First-Half Over 0.5 projection."""
+    @staticmethod
+    def calculate_projection(home_avg: np.ndarray, away_avg: np.ndarray,
+                             market_noise: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculate First-Half Over 0.5 projections for arrays of fixtures."""
         
         combined_avg = (home_avg + away_avg) / 2
-        p_over_05 = 1 - math.exp(-combined_avg)
-        fair_odds = 1 / p_over_05 if p_over_05 > 0 else 10.0
+        p_over_05 = -np.expm1(-combined_avg)  # 1 - e^-x without cancellation at small x
+        fair_odds = 1 / np.where(p_over_05 > 0, p_over_05, 0.1)
         
         # Simulate market odds with realistic spread
-        market_odds = fair_odds * random.uniform(0.85, 1.15)
+        market_odds = fair_odds * market_noise
         edge_pct = (market_odds / fair_odds - 1) * 100
         
         return {
-            'combined_avg': round(combined_avg, 2),
-            'p_over_05': round(p_over_05, 3),
-            'fair_odds': round(fair_odds, 2),
-            'market_odds': round(market_odds, 2),
-            'edge_pct': round(edge_pct, 1)
+            'combined_avg': _py_round(combined_avg, 2),
+            'p_over_05': np.round(p_over_05, 3),
+            'fair_odds': np.round(fair_odds, 2),
+            'market_odds': np.round(market_odds, 2),
+            'edge_pct': np.round(edge_pct, 1)
         }
     
-    def calculate_pnl(self, outcome: str, market_odds: float, stake: float = 100.0) -> float:
+    @staticmethod
+    def calculate_pnl(outcome: np.ndarray, market_odds: np.ndarray, stake: float = 100.0) -> np.ndarray:
         """Calculate PnL for lay betting (laying Under 0.5 Goals)."""
         
-        if outcome == 'WIN':  # Goal scored before half-time
-            return stake * 0.98
-        else:  # 0-0 at half-time
-            return -stake * (market_odds - 1)
+        # Goal scored before half-time wins the stake less commission; 0-0 pays the liability
+        return np.where(outcome == 'WIN', stake * 0.98, -stake * (market_odds - 1))
     
-    async def fetch_league_fixtures_historical(self, league_id: int, season: str = "2024") -> List[Dict]:
-        """Fetch historical fixtures and results for a league."""
+    async def fetch_league_fixtures_historical(self, session: aiohttp.ClientSession, league_id: int,
+                                               season: str = "2024") -> List[Dict]:
+        """Fetch historical fixtures and results for a league, using the local cache when present."""
+        
+        cache_path = os.path.join(self.fixture_cache_dir, f"{league_id}_{season}.parquet")
+        if os.path.exists(cache_path):
+            return pd.read_parquet(cache_path, engine='pyarrow').to_dict('records')
         
         if not self.api_key:
             return []
         
+        # API-Football has no multi-league filter on /fixtures (its `ids` parameter takes
+        # fixture IDs), so there is one request per league; per-request overhead is
+        # amortized by the pooled session, concurrent batches and the parquet cache instead
         try:
-            response = requests.get(f"{self.base_url}/fixtures", 
-                                  headers=self.headers, 
-                                  params={
-                                      'league': league_id,
-                                      'season': season,
-                                      'status': 'FT'  # Only finished matches
-                                  })
-            response.raise_for_status()
+            async with self.request_semaphore:
+                async with session.get(f"{self.base_url}/fixtures",
+                                       params={
+                                           'league': league_id,
+                                           'season': season,
+                                           'status': 'FT'  # Only finished matches
+                                       }) as response:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
+            
+            # Quota and rate-limit failures come back as 200 with an `errors` body;
+            # report them and skip the cache so the next run fetches again
+            if data.get('errors'):
+                print(f"❌ API errors for league {league_id}: {data['errors']}")
+                return []
             
-            data = response.json()
             fixtures = data.get('response', [])
             
             processed_fixtures = []
@@ -216,143 +408,68 @@ class ComprehensiveHistoricalBacktesterFull:
                     'outcome': 'WIN' if first_half_goals > 0 else 'LOSS'
                 })
             
+            # A league with no finished fixtures is cached as an empty, column-less file
+            os.makedirs(self.fixture_cache_dir, exist_ok=True)
+            pd.DataFrame(processed_fixtures).to_parquet(cache_path, engine='pyarrow', index=False)
+            
             return processed_fixtures
             
         except Exception as e:
             print(f"❌ Error fetching historical fixtures for league {league_id}: {e}")
             return []
     
-    async def backtest_league(self, league_id: int, league_name: str, country: str) -> Dict[str, Any]:
+    async def backtest_league(self, session: aiohttp.ClientSession, pool: ProcessPoolExecutor,
+                              league_id: int, league_name: str, country: str,
+                              rng: np.random.Generator) -> Dict[str, Any]:
         """Backtest a single league for the 2024-2025 season."""
         
-        # Fetch historical fixtures
-        fixtures = await self.fetch_league_fixtures_historical(league_id, "2024")
-        
-        if not fixtures:
-            return {
-                'league_name': league_name,
-                'country': country,
-                'total_matches': 0,
-                'bets_placed': 0,
-                'correct_predictions': 0,
-                'accuracy': 0,
-                'total_pnl': 0,
-                'roi': 0,
-                'matches': []
-            }
-        
-        # Sort fixtures by date for chronological processing
-        fixtures.sort(key=lambda x: x['match_date'])
-        
-        # Process each match chronologically
-        league_results = []
-        historical_matches = []  # Store for team average calculation
-        
-        for i, fixture in enumerate(fixtures):
-            # Calculate team averages based on historical matches up to this point
-            home_avg, away_avg = self.calculate_team_averages(
-                fixture['home_team'], 
-                fixture['away_team'], 
-                league_name,
-                historical_matches
-            )
-            
-            # Calculate projection
-            projection = self.calculate_projection(home_avg, away_avg)
-            
-            # Apply betting criteria (combined average >= 1.5)
-            if projection['combined_avg'] >= 1.5:
-                # Calculate PnL based on actual outcome
-                pnl = self.calculate_pnl(fixture['outcome'], projection['market_odds'])
-                
-                result = {
-                    'fixture_id': fixture['fixture_id'],
-                    'league_name': league_name,
-                    'country': country,
-                    'home_team': fixture['home_team'],
-                    'away_team': fixture['away_team'],
-                    'match_date': fixture['match_date'],
-                    'home_avg': home_avg,
-                    'away_avg': away_avg,
-                    'combined_avg': projection['combined_avg'],
-                    'p_over_05': projection['p_over_05'],
-                    'fair_odds': projection['fair_odds'],
-                    'market_odds': projection['market_odds'],
-                    'edge_pct': projection['edge_pct'],
-                    'actual_outcome': fixture['outcome'],
-                    'actual_first_half_goals': fixture['total_first_half_goals'],
-                    'prediction_correct': projection['combined_avg'] >= 1.5 and fixture['outcome'] == 'WIN',
-                    'pnl': round(pnl, 2),
-                    'stake': 100.0
-                }
-                
-                league_results.append(result)
-            
-            # Add this match to historical data for future calculations
-            historical_matches.append(fixture)
-        
-        # Calculate league performance
-        total_matches = len(fixtures)
-        bets_placed = len(league_results)
-        correct_predictions = sum(1 for r in league_results if r['prediction_correct'])
-        accuracy = correct_predictions / bets_placed if bets_placed > 0 else 0
-        total_pnl = sum(r['pnl'] for r in league_results)
-        roi = total_pnl / (bets_placed * 100) * 100 if bets_placed > 0 else 0
+        # Fetch historical fixtures on the event loop
+        fixtures = await self.fetch_league_fixtures_historical(session, league_id, "2024")
         
-        return {
-            'league_name': league_name,
-            'country': country,
-            'total_matches': total_matches,
-            'bets_placed': bets_placed,
-            'correct_predictions': correct_predictions,
-            'accuracy': round(accuracy, 3),
-            'total_pnl': round(total_pnl, 2),
-            'roi': round(roi, 1),
-            'matches': league_results
-        }
+        # The CPU-bound backtest runs in a worker process with only the data it needs
+        tier_info = self.league_tiers.get(league_name, {'tier': 3, 'min_avg': 0.8, 'max_avg': 1.4})
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, _backtest_league_pure, fixtures, league_name, country,
+                                          tier_info, rng)
     
-    async def process_batch(self, batch_leagues: pd.DataFrame, batch_num: int) -> List[Dict]:
-        """Process a batch of leagues."""
+    async def process_batch(self, session: aiohttp.ClientSession, pool: ProcessPoolExecutor,
+                            batch_leagues: pd.DataFrame, batch_num: int) -> List[Dict]:
+        """Process a batch of leagues concurrently."""
         
         print(f"\n🔄 PROCESSING BATCH {batch_num}/{self.total_batches}")
         print(f"   Leagues in batch: {len(batch_leagues)}")
         print("=" * 50)
         
+        # Every league in the batch is fetched at once; the semaphore paces the API calls.
+        # Child generators are spawned in league order so results don't depend on scheduling.
+        leagues = list(batch_leagues.itertuples(index=False))
+        league_rngs = self.rng.spawn(len(leagues))
+        tasks = [
+            self.backtest_league(session, pool, league.League_ID, league.League_Name, league.Country, rng)
+            for league, rng in zip(leagues, league_rngs)
+        ]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        
         batch_results = []
         
-        for i, (_, league) in enumerate(batch_leagues.iterrows(), 1):
-            league_id = league['League_ID']
-            league_name = league['League_Name']
-            country = league['Country']
+        for i, (league, result) in enumerate(zip(leagues, outcomes), 1):
+            league_name = league.League_Name
+            country = league.Country
             
             print(f"[{i:2d}/{len(batch_leagues)}] {league_name:30s} ({country:15s})...", end=" ")
             
-            try:
-                result = await self.backtest_league(league_id, league_name, country)
-                batch_results.append(result)
-                
-                # Display quick result
-                if result['bets_placed'] > 0:
-                    print(f"✅ {result['bets_placed']:3d} bets | {result['accuracy']:5.1%} | ${result['total_pnl']:8.2f}")
-                else:
-                    print("❌ No data")
-                
-                # Rate limiting
-                await asyncio.sleep(self.request_delay)
-                
-            except Exception as e:
-                print(f"❌ Error: {str(e)[:50]}...")
-                batch_results.append({
-                    'league_name': league_name,
-                    'country': country,
-                    'total_matches': 0,
-                    'bets_placed': 0,
-                    'correct_predictions': 0,
-                    'accuracy': 0,
-                    'total_pnl': 0,
-                    'roi': 0,
-                    'matches': []
-                })
+            if isinstance(result, Exception):
+                print(f"❌ Error: {str(result)[:50]}...")
+                batch_results.append(_empty_league_summary(league_name, country))
+                continue
+            
+            batch_results.append(result)
+            
+            # Display quick result
+            if result['bets_placed'] > 0:
+                print(f"✅ {result['bets_placed']:3d} bets | {result['accuracy']:5.1%} | ${result['total_pnl']:8.2f}")
+            else:
+                print("❌ No data")
         
         return batch_results
     
@@ -369,28 +486,35 @@ class ComprehensiveHistoricalBacktesterFull:
         # Calculate total batches
         self.total_batches = (len(self.all_leagues) + self.batch_size - 1) // self.batch_size
         
-        all_results = []
+        result_frames = []  # Per-league bet DataFrames, concatenated once at the end
         league_summaries = []
         
-        # Process leagues in batches
-        for batch_num in range(1, self.total_batches + 1):
-            start_idx = (batch_num - 1) * self.batch_size
-            end_idx = min(start_idx + self.batch_size, len(self.all_leagues))
-            batch_leagues = self.all_leagues.iloc[start_idx:end_idx]
-            
-            # Process this batch
-            batch_results = await self.process_batch(batch_leagues, batch_num)
-            league_summaries.extend(batch_results)
-            
-            # Store individual match results
-            for result in batch_results:
-                for match in result['matches']:
-                    all_results.append(match)
-            
-            # Save intermediate results after each batch
-            if batch_num % 5 == 0:  # Save every 5 batches
-                self._save_intermediate_results(league_summaries, all_results, batch_num)
-                print(f"\n💾 Intermediate results saved after batch {batch_num}")
+        # One pooled HTTP session is shared by every request in the run
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent_requests)
+        try:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+                    # Process leagues in batches
+                    for batch_num in range(1, self.total_batches + 1):
+                        start_idx = (batch_num - 1) * self.batch_size
+                        end_idx = min(start_idx + self.batch_size, len(self.all_leagues))
+                        batch_leagues = self.all_leagues.iloc[start_idx:end_idx]
+                        
+                        # Process this batch
+                        batch_results = await self.process_batch(session, pool, batch_leagues, batch_num)
+                        league_summaries.extend(batch_results)
+                        
+                        # Store individual match results
+                        result_frames.extend(r['matches'] for r in batch_results if not r['matches'].empty)
+                        
+                        # Save intermediate results after each batch
+                        if batch_num % 5 == 0:  # Save every 5 batches
+                            self._save_intermediate_results(league_summaries, result_frames, batch_num)
+                            print(f"\n💾 Intermediate results saved after batch {batch_num}")
+        finally:
+            self._close_intermediate_writers()
+        
+        all_results = pd.concat(result_frames, ignore_index=True) if result_frames else pd.DataFrame()
         
         # Calculate overall statistics
         total_matches = sum(r['total_matches'] for r in league_summaries)
@@ -416,17 +540,52 @@ class ComprehensiveHistoricalBacktesterFull:
             'all_results': all_results
         }
     
-    def _save_intermediate_results(self, league_summaries: List[Dict], all_results: List[Dict], batch_num: int):
-        """Save intermediate results during processing."""
-        
-        # Save league summaries
-        df_summaries = pd.DataFrame(league_summaries)
-        df_summaries.to_csv(f"intermediate_batch_{batch_num}_league_summary.csv", index=False)
-        
-        # Save all individual results
-        if all_results:
-            df_results = pd.DataFrame(all_results)
-            df_results.to_csv(f"intermediate_batch_{batch_num}_all_results.csv", index=False)
+    def _save_intermediate_results(self, league_summaries: List[Dict], result_frames: List[pd.DataFrame],
+                                   batch_num: int):
+        """Append the rows produced since the last save to the intermediate parquet files."""
+        
+        new_summaries = league_summaries[self._last_saved_summaries:]
+        if new_summaries:
+            table = pa.Table.from_pylist(new_summaries, schema=_SUMMARY_SCHEMA)
+            if self._summaries_writer is None:
+                self._summaries_writer = pq.ParquetWriter("intermediate_league_summary.parquet", _SUMMARY_SCHEMA)
+            self._summaries_writer.write_table(table)
+            self._last_saved_summaries = len(league_summaries)
+        
+        new_results = result_frames[self._last_saved_results:]
+        if new_results:
+            table = pa.Table.from_pandas(pd.concat(new_results, ignore_index=True),
+                                         schema=_RESULT_SCHEMA, preserve_index=False)
+            if self._results_writer is None:
+                self._results_writer = pq.ParquetWriter("intermediate_all_results.parquet", _RESULT_SCHEMA)
+            self._results_writer.write_table(table)
+            self._last_saved_results = len(result_frames)
+    
+    def _close_intermediate_writers(self):
+        """Close the intermediate parquet writers so their footers are written."""
+        
+        for writer in (self._summaries_writer, self._results_writer):
+            if writer is not None:
+                writer.close()
+        self._summaries_writer = None
+        self._results_writer = None
+    
+    @staticmethod
+    def _country_stats_df(league_summaries: List[Dict]) -> pd.DataFrame:
+        """Aggregate leagues with bets by country, sorted by total PnL (best first)."""
+        
+        leagues = pd.DataFrame(league_summaries, columns=['country', 'bets_placed', 'total_pnl', 'accuracy'])
+        leagues = leagues[leagues['bets_placed'] > 0]
+        
+        countries = leagues.groupby('country', sort=False).agg(
+            total_bets=('bets_placed', 'sum'),
+            total_pnl=('total_pnl', 'sum'),
+            avg_accuracy=('accuracy', 'mean'),
+            leagues_count=('bets_placed', 'count')
+        ).reset_index()
+        countries['roi'] = countries['total_pnl'] / (countries['total_bets'] * 100) * 100
+        
+        return countries.sort_values('total_pnl', ascending=False, kind='stable').reset_index(drop=True)
     
     def display_results(self, backtest_data: Dict[str, Any]):
         """Display comprehensive backtesting results."""
@@ -468,36 +627,14 @@ class ComprehensiveHistoricalBacktesterFull:
                   f"${league['total_pnl']:8.2f} | {league['roi']:6.1f}% ROI")
         
         # Country performance analysis
-        country_stats = defaultdict(lambda: {'bets': 0, 'pnl': 0, 'accuracy': 0, 'leagues': 0})
-        for league in league_summaries:
-            if league['bets_placed'] > 0:
-                country = league['country']
-                country_stats[country]['bets'] += league['bets_placed']
-                country_stats[country]['pnl'] += league['total_pnl']
-                country_stats[country]['accuracy'] += league['accuracy']
-                country_stats[country]['leagues'] += 1
-        
-        # Calculate country averages
-        country_performance = []
-        for country, stats in country_stats.items():
-            if stats['leagues'] > 0:
-                country_performance.append({
-                    'country': country,
-                    'total_bets': stats['bets'],
-                    'total_pnl': stats['pnl'],
-                    'avg_accuracy': stats['accuracy'] / stats['leagues'],
-                    'leagues_count': stats['leagues'],
-                    'roi': (stats['pnl'] / (stats['bets'] * 100) * 100) if stats['bets'] > 0 else 0
-                })
-        
-        country_performance.sort(key=lambda x: x['total_pnl'], reverse=True)
+        country_performance = self._country_stats_df(league_summaries)
         
         print(f"\n🌍 TOP PERFORMING COUNTRIES (by PnL)")
         print("=" * 70)
-        for i, country in enumerate(country_performance[:15], 1):
-            print(f"{i:2d}. {country['country']:20s} | {country['leagues_count']:2d} leagues | "
-                  f"{country['total_bets']:4d} bets | {country['avg_accuracy']:5.1%} | "
-                  f"${country['total_pnl']:8.2f} | {country['roi']:6.1f}% ROI")
+        for i, country in enumerate(country_performance.head(15).itertuples(index=False), 1):
+            print(f"{i:2d}. {country.country:20s} | {country.leagues_count:2d} leagues | "
+                  f"{country.total_bets:4d} bets | {country.avg_accuracy:5.1%} | "
+                  f"${country.total_pnl:8.2f} | {country.roi:6.1f}% ROI")
     
     def save_results(self, backtest_data: Dict[str, Any], filename_prefix: str = "comprehensive_backtest_full"):
         """Save comprehensive backtesting results."""
@@ -507,52 +644,29 @@ class ComprehensiveHistoricalBacktesterFull:
         all_results = backtest_data['all_results']
         
         # Save overall statistics
-        with open(f"{filename_prefix}_overall.json", 'w') as f:
-            json.dump(overall, f, indent=2)
+        with open(f"{filename_prefix}_overall.json", 'wb') as f:
+            f.write(orjson.dumps(overall, option=orjson.OPT_INDENT_2))
         print(f"💾 Overall statistics saved to {filename_prefix}_overall.json")
         
         # Save league summaries
-        df_summaries = pd.DataFrame(league_summaries)
+        df_summaries = pd.DataFrame(league_summaries).drop(columns='matches', errors='ignore')
         df_summaries.to_csv(f"{filename_prefix}_league_summary.csv", index=False)
         print(f"💾 League summaries saved to {filename_prefix}_league_summary.csv")
         
         # Save all individual results
-        if all_results:
-            df_results = pd.DataFrame(all_results)
-            df_results.to_csv(f"{filename_prefix}_all_results.csv", index=False)
+        if not all_results.empty:
+            all_results.to_csv(f"{filename_prefix}_all_results.csv", index=False)
             print(f"💾 All individual results saved to {filename_prefix}_all_results.csv")
             
             # Save top performing leagues
             profitable_leagues = [l for l in league_summaries if l['bets_placed'] > 0 and l['total_pnl'] > 0]
             profitable_leagues.sort(key=lambda x: x['total_pnl'], reverse=True)
-            df_profitable = pd.DataFrame(profitable_leagues)
+            df_profitable = pd.DataFrame(profitable_leagues).drop(columns='matches', errors='ignore')
             df_profitable.to_csv(f"{filename_prefix}_profitable_leagues.csv", index=False)
             print(f"💾 Profitable leagues saved to {filename_prefix}_profitable_leagues.csv")
             
             # Save country performance
-            country_stats = defaultdict(lambda: {'bets': 0, 'pnl': 0, 'accuracy': 0, 'leagues': 0})
-            for league in league_summaries:
-                if league['bets_placed'] > 0:
-                    country = league['country']
-                    country_stats[country]['bets'] += league['bets_placed']
-                    country_stats[country]['pnl'] += league['total_pnl']
-                    country_stats[country]['accuracy'] += league['accuracy']
-                    country_stats[country]['leagues'] += 1
-            
-            country_performance = []
-            for country, stats in country_stats.items():
-                if stats['leagues'] > 0:
-                    country_performance.append({
-                        'country': country,
-                        'total_bets': stats['bets'],
-                        'total_pnl': stats['pnl'],
-                        'avg_accuracy': stats['accuracy'] / stats['leagues'],
-                        'leagues_count': stats['leagues'],
-                        'roi': (stats['pnl'] / (stats['bets'] * 100) * 100) if stats['bets'] > 0 else 0
-                    })
-            
-            country_performance.sort(key=lambda x: x['total_pnl'], reverse=True)
-            df_countries = pd.DataFrame(country_performance)
+            df_countries = self._country_stats_df(league_summaries)
             df_countries.to_csv(f"{filename_prefix}_country_performance.csv", index=False)
             print(f"💾 Country performance saved to {filename_prefix}_country_performance.csv")
 
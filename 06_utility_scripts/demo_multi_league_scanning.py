@@ -9,6 +9,10 @@ import requests
 from datetime import datetime, timedelta
 import pandas as pd
 import random
+import numpy as np
+
+# Shared generator for the simulated scan draws
+_RNG = np.random.default_rng()
 
 def get_api_key():
     """Get API key from config."""
@@ -19,47 +23,42 @@ def get_api_key():
     except:
         return ""
 
+FIXTURE_COLUMNS = ['league_id', 'league_name', 'country', 'home_team', 'away_team', 'match_date']
+
 def simulate_scanning_logic(fixtures):
     """Simulate the First-Half Over 0.5 scanning logic."""
     
-    results = []
+    fixtures = pd.DataFrame(fixtures, columns=FIXTURE_COLUMNS)
+    n = len(fixtures)
     
-    for fixture in fixtures:
-        # Simulate team averages (in real implementation, this would be calculated from historical data)
-        home_avg = random.uniform(0.3, 2.5)
-        away_avg = random.uniform(0.3, 2.5)
-        combined_avg = (home_avg + away_avg) / 2
-        
-        # Apply the simple algorithm: combined average >= 1.5
-        if combined_avg >= 1.5:
-            # Simulate odds and PnL calculation
-            under_05_odds = random.uniform(2.0, 6.0)
-            
-            # Simulate match outcome (WIN = goal scored, LOSS = 0-0 at half-time)
-            outcome = random.choice(['WIN', 'LOSS'])
-            
-            # Calculate PnL for lay betting (laying Under 0.5 Goals)
-            if outcome == 'WIN':  # Goal scored before half-time
-                pnl = 98.0  # +$100 - 2% commission
-            else:  # 0-0 at half-time
-                pnl = -100.0 * (under_05_odds - 1)  # Loss based on odds
-            
-            results.append({
-                'league_id': fixture['league_id'],
-                'league_name': fixture['league_name'],
-                'country': fixture['country'],
-                'home_team': fixture['home_team'],
-                'away_team': fixture['away_team'],
-                'match_date': fixture['match_date'],
-                'home_avg': round(home_avg, 2),
-                'away_avg': round(away_avg, 2),
-                'combined_avg': round(combined_avg, 2),
-                'under_05_odds': round(under_05_odds, 2),
-                'outcome': outcome,
-                'pnl': round(pnl, 2),
-                'stake': 100.0,
-                'signal': 'BET' if combined_avg >= 1.5 else 'NO_BET'
-            })
+    # Simulate team averages (in real implementation, this would be calculated from historical data)
+    home_avg = _RNG.uniform(0.3, 2.5, n)
+    away_avg = _RNG.uniform(0.3, 2.5, n)
+    combined_avg = (home_avg + away_avg) / 2
+    
+    # Apply the simple algorithm: combined average >= 1.5
+    bet_mask = combined_avg >= 1.5
+    num_bets = int(bet_mask.sum())
+    
+    # Simulate odds and PnL calculation
+    under_05_odds = _RNG.uniform(2.0, 6.0, num_bets)
+    
+    # Simulate match outcome (WIN = goal scored, LOSS = 0-0 at half-time)
+    is_win = _RNG.integers(0, 2, num_bets).astype(bool)
+    
+    # Calculate PnL for lay betting (laying Under 0.5 Goals):
+    # +$100 - 2% commission on a goal, loss based on odds at 0-0
+    pnl = np.where(is_win, 98.0, -100.0 * (under_05_odds - 1))
+    
+    results = fixtures[bet_mask].reset_index(drop=True)
+    results['home_avg'] = home_avg[bet_mask].round(2)
+    results['away_avg'] = away_avg[bet_mask].round(2)
+    results['combined_avg'] = combined_avg[bet_mask].round(2)
+    results['under_05_odds'] = under_05_odds.round(2)
+    results['outcome'] = np.where(is_win, 'WIN', 'LOSS')
+    results['pnl'] = pnl.round(2)
+    results['stake'] = 100.0
+    results['signal'] = 'BET'
     
     return results
 
@@ -134,38 +133,36 @@ async def demonstrate_multi_league_scanning():
     results = simulate_scanning_logic(all_fixtures)
     
     # Filter for actual bets
-    bets = [r for r in results if r['signal'] == 'BET']
+    bets = results[results['signal'] == 'BET']
     
     print(f"✅ Found {len(bets)} potential bets out of {len(all_fixtures)} fixtures")
     print(f"   Bet rate: {len(bets)/len(all_fixtures)*100:.1f}%")
     
-    # Group results by league
-    bets_by_league = {}
-    for bet in bets:
-        league = bet['league_name']
-        if league not in bets_by_league:
-            bets_by_league[league] = []
-        bets_by_league[league].append(bet)
+    # Aggregate results by league in one groupby pass
+    league_stats = bets.groupby('league_name', sort=False).agg(
+        bets=('pnl', 'count'), total_pnl=('pnl', 'sum'), avg_pnl=('pnl', 'mean')
+    )
+    top_bets_by_league = dict(tuple(
+        bets.sort_values('combined_avg', ascending=False, kind='stable')
+        .groupby('league_name', sort=False).head(3)
+        .groupby('league_name', sort=False)
+    ))
     
     # Display results by league
     print(f"\n🏆 RESULTS BY LEAGUE")
     print("=" * 60)
     
-    total_pnl = 0
+    total_pnl = league_stats['total_pnl'].sum()
     
-    for league_name, league_bets in bets_by_league.items():
-        league_pnl = sum(bet['pnl'] for bet in league_bets)
-        total_pnl += league_pnl
-        
-        print(f"\n📊 {league_name} ({len(league_bets)} bets)")
-        print(f"   Total PnL: ${league_pnl:.2f}")
-        print(f"   Average PnL per bet: ${league_pnl/len(league_bets):.2f}")
+    for league_name, league in zip(league_stats.index, league_stats.itertuples(index=False)):
+        print(f"\n📊 {league_name} ({league.bets} bets)")
+        print(f"   Total PnL: ${league.total_pnl:.2f}")
+        print(f"   Average PnL per bet: ${league.avg_pnl:.2f}")
         
         # Show top 3 bets
-        top_bets = sorted(league_bets, key=lambda x: x['combined_avg'], reverse=True)[:3]
-        for bet in top_bets:
-            print(f"   🎯 {bet['home_team']} vs {bet['away_team']}")
-            print(f"      Combined Avg: {bet['combined_avg']}, Odds: {bet['under_05_odds']}, PnL: ${bet['pnl']:.2f}")
+        for bet in top_bets_by_league[league_name].itertuples(index=False):
+            print(f"   🎯 {bet.home_team} vs {bet.away_team}")
+            print(f"      Combined Avg: {bet.combined_avg}, Odds: {bet.under_05_odds}, PnL: ${bet.pnl:.2f}")
     
     # Overall summary
     print(f"\n📈 OVERALL SUMMARY")
@@ -175,28 +172,22 @@ async def demonstrate_multi_league_scanning():
     print(f"   Total Bets: {len(bets)}")
     print(f"   Bet Rate: {len(bets)/len(all_fixtures)*100:.1f}%")
     print(f"   Total PnL: ${total_pnl:.2f}")
-    print(f"   Average PnL per Bet: ${total_pnl/len(bets):.2f}" if bets else "   Average PnL per Bet: $0.00")
-    print(f"   ROI: {total_pnl/(len(bets)*100)*100:.1f}%" if bets else "   ROI: 0.0%")
+    print(f"   Average PnL per Bet: ${total_pnl/len(bets):.2f}" if len(bets) else "   Average PnL per Bet: $0.00")
+    print(f"   ROI: {total_pnl/(len(bets)*100)*100:.1f}%" if len(bets) else "   ROI: 0.0%")
     
     # Save detailed results
-    if bets:
-        df_results = pd.DataFrame(bets)
-        df_results.to_csv('multi_league_scanning_results.csv', index=False)
+    if len(bets):
+        bets.to_csv('multi_league_scanning_results.csv', index=False)
         print(f"\n💾 Detailed results saved to multi_league_scanning_results.csv")
         
         # Create league summary
-        league_summary = []
-        for league_name, league_bets in bets_by_league.items():
-            league_pnl = sum(bet['pnl'] for bet in league_bets)
-            league_summary.append({
-                'League': league_name,
-                'Bets': len(league_bets),
-                'Total_PnL': round(league_pnl, 2),
-                'Avg_PnL': round(league_pnl/len(league_bets), 2),
-                'ROI': round(league_pnl/(len(league_bets)*100)*100, 1)
-            })
-        
-        df_summary = pd.DataFrame(league_summary)
+        df_summary = pd.DataFrame({
+            'League': league_stats.index,
+            'Bets': league_stats['bets'].to_numpy(),
+            'Total_PnL': league_stats['total_pnl'].round(2).to_numpy(),
+            'Avg_PnL': league_stats['avg_pnl'].round(2).to_numpy(),
+            'ROI': (league_stats['total_pnl'] / (league_stats['bets'] * 100) * 100).round(1).to_numpy()
+        })
         df_summary.to_csv('multi_league_league_summary.csv', index=False)
         print(f"💾 League summary saved to multi_league_league_summary.csv")
     
@@ -4,106 +4,225 @@ Extract all leagues and matches from GB_24_25.tar dataset
 """
 
 import tarfile
-import json
+import msgspec
 import bz2
+import io
 import pandas as pd
-from collections import defaultdict
-import re
-from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+from functools import lru_cache
+import ahocorasick
 
-def extract_all_gb_leagues(tar_file_path):
-    """Extract all leagues and matches from the GB dataset."""
+# Typed views of a stream message: msgspec fills only these fields and skips
+# everything else (prices, runners, ...) without building dicts for it
+class MarketDefinition(msgspec.Struct):
+    name: str = ''
+    eventName: str = ''
+    eventId: str = ''
+    marketTime: str = ''
+
+class MarketChange(msgspec.Struct):
+    marketDefinition: MarketDefinition | None = None
+
+class StreamMessage(msgspec.Struct):
+    mc: list[MarketChange] = []
+
+_MESSAGE_DECODER = msgspec.json.Decoder(StreamMessage)
+
+_TARGET_MARKET = b'First Half Goals 0.5'
+MEMBERS_PER_TASK = 4
+
+MATCHES_PARQUET = 'all_gb_leagues_matches.parquet'
+MATCH_COLUMNS = ['League', 'Event_ID', 'Event_Name', 'Home_Team', 'Away_Team', 'Date', 'Market_Time']
+MATCH_SCHEMA = pa.schema([(column, pa.string()) for column in MATCH_COLUMNS])
+MATCH_BATCH_ROWS = 50_000
+SAMPLE_MATCHES = 5
+
+def _decode_and_filter(task):
+    """Decompress one bz2 tar member and return its (league, match_info) hits."""
+    member_name, raw = task
+    hits = []
+    try:
+        # Decompress incrementally and decode the byte lines as they come,
+        # so the whole decompressed member is never held in memory; lines
+        # stay bytes from BZ2File through the prefilter into msgspec, with
+        # no separate UTF-8 decode pass
+        with bz2.open(io.BytesIO(raw), 'rb') as lines:
+            for line in lines:
+                # Cheap byte-substring tests: only lines naming the target market
+                # inside a market change can produce a hit, so skip the rest unparsed
+                if _TARGET_MARKET not in line or b'"mc"' not in line:
+                    continue
+                
+                try:
+                    message = _MESSAGE_DECODER.decode(line)
+                except msgspec.DecodeError:
+                    continue
+                
+                for market in message.mc:
+                    md = market.marketDefinition
+                    
+                    # Check if it's a first half goals market
+                    if md is None or 'First Half Goals 0.5' not in md.name:
+                        continue
+                    
+                    # Extract league and teams
+                    league, home_team, away_team = extract_league_and_teams(md.eventName)
+                    
+                    if league and home_team and away_team:
+                        # Store match info
+                        hits.append((league, {
+                            'event_id': md.eventId,
+                            'event_name': md.eventName,
+                            'home_team': home_team,
+                            'away_team': away_team,
+                            'market_time': md.marketTime,
+                            'date': md.marketTime[:10]
+                        }))
+    
+    except Exception as e:
+        return member_name, hits, e
+    
+    return member_name, hits, None
+
+class LeagueBucket:
+    """Per-league accumulator for extracted matches."""
+    
+    __slots__ = ('samples', 'unique_matches', 'seen', 'total_events', 'min_date', 'max_date')
+    
+    def __init__(self):
+        self.samples = []
+        self.unique_matches = 0
+        self.seen = set()
+        self.total_events = 0
+        self.min_date = None
+        self.max_date = None
+
+def _decode_batch(tasks):
+    """Run _decode_and_filter over a batch of members in one worker call."""
+    return [_decode_and_filter(task) for task in tasks]
+
+def extract_all_gb_leagues(tar_file_path, matches_path=MATCHES_PARQUET):
+    """Extract all leagues and matches from the GB dataset, streaming matches to Parquet."""
     
     print("🔍 Extracting all leagues and matches from GB_24_25.tar...")
     print("=" * 60)
     
-    leagues_data = defaultdict(lambda: {
-        'matches': [],
-        'date_range': set(),
-        'total_events': 0
-    })
+    leagues_data = defaultdict(LeagueBucket)
     
-    total_files = 0
     processed_files = 0
     
-    try:
-        with tarfile.open(tar_file_path, 'r') as tar:
-            total_files = len(tar.getnames())
-            print(f"Total files in archive: {total_files}")
+    # Unique matches are buffered column-wise and flushed as Parquet row groups,
+    # so memory stays bounded however many matches the archive holds
+    writer = pq.ParquetWriter(matches_path, MATCH_SCHEMA, compression='zstd')
+    rows = {column: [] for column in MATCH_COLUMNS}
+    
+    def flush():
+        if rows['League']:
+            writer.write_table(pa.Table.from_pydict(rows, schema=MATCH_SCHEMA))
+            for column in rows.values():
+                column.clear()
+    
+    def merge(result):
+        nonlocal processed_files
+        member_name, hits, error = result
+        for league, match_info in hits:
+            league_data = leagues_data[league]
+            league_data.total_events += 1
+            
+            # Running date range; ISO date strings compare chronologically
+            date = match_info['date']
+            if league_data.min_date is None or date < league_data.min_date:
+                league_data.min_date = date
+            if league_data.max_date is None or date > league_data.max_date:
+                league_data.max_date = date
             
-            for member in tar.getmembers():
-                if member.name.endswith('.bz2'):
+            # Avoid duplicates; the remaining fields are derived from these three
+            key = (match_info['event_id'], match_info['event_name'], match_info['market_time'])
+            if key not in league_data.seen:
+                league_data.seen.add(key)
+                league_data.unique_matches += 1
+                if len(league_data.samples) < SAMPLE_MATCHES:
+                    league_data.samples.append(match_info)
+                
+                rows['League'].append(league)
+                rows['Event_ID'].append(match_info['event_id'])
+                rows['Event_Name'].append(match_info['event_name'])
+                rows['Home_Team'].append(match_info['home_team'])
+                rows['Away_Team'].append(match_info['away_team'])
+                rows['Date'].append(match_info['date'])
+                rows['Market_Time'].append(match_info['market_time'])
+                if len(rows['League']) >= MATCH_BATCH_ROWS:
+                    flush()
+        if error is not None:
+            print(f"Error processing {member_name}: {error}")
+            return
+        processed_files += 1
+        if processed_files % 500 == 0:
+            print(f"Processed {processed_files} files...")
+    
+    try:
+        # Stream the archive: members are read in order, so no index is built
+        with tarfile.open(tar_file_path, 'r|') as tar:
+            # Tar reads stay here; decompression and parsing run in worker
+            # processes, with a bounded window of payloads in flight
+            workers = os.cpu_count() or 1
+            max_pending = workers * 2
+            pending = deque()
+            batch = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for member in tar:
+                    if not member.name.endswith('.bz2'):
+                        continue
                     try:
                         file_obj = tar.extractfile(member)
-                        if file_obj:
-                            decompressed = bz2.decompress(file_obj.read())
-                            lines = decompressed.decode('utf-8').strip().split('\n')
-                            
-                            for line in lines:
-                                if line.strip():
-                                    try:
-                                        data = json.loads(line)
-                                        
-                                        if 'mc' in data and data['mc']:
-                                            for market in data['mc']:
-                                                if 'marketDefinition' in market:
-                                                    md = market['marketDefinition']
-                                                    
-                                                    # Check if it's a first half goals market
-                                                    if 'name' in md and 'First Half Goals 0.5' in md['name']:
-                                                        event_name = md.get('eventName', '')
-                                                        event_id = md.get('eventId', '')
-                                                        market_time = md.get('marketTime', '')
-                                                        
-                                                        # Extract league and teams
-                                                        league, home_team, away_team = extract_league_and_teams(event_name)
-                                                        
-                                                        if league and home_team and away_team:
-                                                            leagues_data[league]['total_events'] += 1
-                                                            leagues_data[league]['date_range'].add(market_time[:10])
-                                                            
-                                                            # Store match info
-                                                            match_info = {
-                                                                'event_id': event_id,
-                                                                'event_name': event_name,
-                                                                'home_team': home_team,
-                                                                'away_team': away_team,
-                                                                'market_time': market_time,
-                                                                'date': market_time[:10]
-                                                            }
-                                                            
-                                                            # Avoid duplicates
-                                                            if match_info not in leagues_data[league]['matches']:
-                                                                leagues_data[league]['matches'].append(match_info)
-                                        
-                                    except json.JSONDecodeError:
-                                        continue
-                            
-                            processed_files += 1
-                            if processed_files % 500 == 0:
-                                print(f"Processed {processed_files}/{total_files} files...")
-                                
+                        if not file_obj:
+                            continue
+                        raw = file_obj.read()
                     except Exception as e:
                         print(f"Error processing {member.name}: {e}")
                         continue
+                    
+                    # Ship members in small batches to amortize per-task IPC
+                    batch.append((member.name, raw))
+                    if len(batch) < MEMBERS_PER_TASK:
+                        continue
+                    pending.append(executor.submit(_decode_batch, batch))
+                    batch = []
+                    if len(pending) >= max_pending:
+                        for result in pending.popleft().result():
+                            merge(result)
+                
+                if batch:
+                    pending.append(executor.submit(_decode_batch, batch))
+                while pending:
+                    for result in pending.popleft().result():
+                        merge(result)
+        
+        flush()
     
     except Exception as e:
         print(f"Error opening tar file: {e}")
         return None
     
+    finally:
+        writer.close()
+    
     print(f"\n✅ Extraction complete! Processed {processed_files} files")
     
     # Convert to summary
     league_summary = []
     for league, data in leagues_data.items():
-        if data['total_events'] > 0:
-            date_range = sorted(data['date_range'])
+        if data.total_events > 0:
             league_summary.append({
                 'League': league,
-                'Total_Events': data['total_events'],
-                'Unique_Matches': len(data['matches']),
-                'Date_Range': f"{date_range[0]} to {date_range[-1]}" if date_range else "Unknown",
-                'Matches': data['matches']
+                'Total_Events': data.total_events,
+                'Unique_Matches': data.unique_matches,
+                'Date_Range': f"{data.min_date} to {data.max_date}" if data.min_date is not None else "Unknown",
+                'Sample_Matches': data.samples
             })
     
     # Sort by event count
@@ -111,69 +230,99 @@ def extract_all_gb_leagues(tar_file_path):
     
     return league_summary
 
+# Common team/competition names for different leagues, checked in priority order
+LEAGUE_TEAMS = {
+    'Premier League': ['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest'],
+    'Championship': ['Championship', 'Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Leeds', 'Sheffield Wednesday'],
+    'League One': ['League One', 'Barnsley', 'Blackpool', 'Bolton', 'Bristol Rovers', 'Burton', 'Cambridge', 'Charlton', 'Derby', 'Exeter', 'Fleetwood', 'Ipswich', 'Lincoln', 'MK Dons', 'Morecambe', 'Oxford', 'Peterborough', 'Plymouth', 'Portsmouth', 'Port Vale', 'Shrewsbury', 'Sunderland', 'Wigan', 'Wycombe'],
+    'League Two': ['League Two', 'AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town'],
+    'Scottish Premiership': ['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock'],
+    'Scottish Championship': ['Scottish Championship', 'Dundee United', 'Inverness', 'Partick Thistle', 'Ayr United', 'Dunfermline', 'Greenock Morton', 'Queen of the South', 'Raith Rovers'],
+    'Scottish League One': ['Scottish League One', 'Airdrieonians', 'Alloa', 'Clyde', 'Cove Rangers', 'East Fife', 'Falkirk', 'Forfar', 'Montrose', 'Peterhead', 'Stranraer'],
+    'Scottish League Two': ['Scottish League Two', 'Albion Rovers', 'Annan', 'Berwick', 'Cowdenbeath', 'Edinburgh City', 'Elgin', 'Stirling', 'Stenhousemuir'],
+    "Women's Super League": ['Women', 'WSL', 'Arsenal Women', 'Chelsea Women', 'Man City Women', 'Man United Women', 'Tottenham Women', 'Everton Women', 'Brighton Women', 'Aston Villa Women', 'West Ham Women', 'Birmingham Women', 'Reading Women'],
+    'National League': ['National League', 'Wrexham', 'Notts County', 'Chesterfield', 'Boreham Wood', 'Bromley', 'Dagenham', 'Eastleigh', 'FC Halifax', 'Gateshead', 'Grimsby', 'Hartlepool', 'Maidenhead', 'Maidstone', 'Oldham', 'Solihull', 'Southend', 'Stockport', 'Torquay', 'Woking', 'Yeovil'],
+}
+
+# Team sets used when no league name appears in the raw event name
+PL_TEAMS = frozenset(['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest'])
+CHAMP_TEAMS = frozenset(['Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Sheffield Wednesday'])
+SCOTTISH_TEAMS = frozenset(['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock'])
+LEAGUE_TWO_TEAMS = frozenset(['AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town'])
+
+# Checked in priority order against the exact home/away names
+FALLBACK_TEAMS = [
+    ('Premier League', PL_TEAMS),
+    ('Championship', CHAMP_TEAMS),
+    ('Scottish Premiership', SCOTTISH_TEAMS),
+    ('League Two', LEAGUE_TWO_TEAMS),
+]
+
+def _build_automaton(groups, ignore_case=False):
+    """Build one Aho-Corasick automaton mapping each name to its highest-priority league."""
+    automaton = ahocorasick.Automaton()
+    for priority, (league, names) in enumerate(groups.items()):
+        for name in names:
+            key = name.lower() if ignore_case else name
+            if key not in automaton:
+                automaton.add_word(key, (priority, league))
+    automaton.make_automaton()
+    return automaton
+
+def _best_hit(automaton, text):
+    """Return the highest-priority (priority, league) hit occurring in text, or None."""
+    return min((value for _, value in automaton.iter(text)), default=None)
+
+def _first_league(automaton, text):
+    """Return the highest-priority league with a name occurring in text, or None."""
+    hit = _best_hit(automaton, text)
+    return hit[1] if hit else None
+
+_LEAGUE_AUTOMATON = _build_automaton(LEAGUE_TEAMS, ignore_case=True)
+
+# Exact (lowercased) team name -> best (priority, league) hit inside that name.
+# No listed name contains ' v ', so when both teams are known the event's
+# classification is just the better of the two entries.
+TEAM_TO_LEAGUE = {
+    name.lower(): _best_hit(_LEAGUE_AUTOMATON, name.lower())
+    for names in LEAGUE_TEAMS.values()
+    for name in names
+}
+
+@lru_cache(maxsize=200_000)
 def extract_league_and_teams(event_name):
     """Extract league name and team names from event name."""
     
-    # Common patterns for different leagues
-    league_patterns = {
-        'Premier League': r'(Arsenal|Chelsea|Liverpool|Man City|Man United|Tottenham|Newcastle|West Ham|Aston Villa|Brighton|Crystal Palace|Everton|Fulham|Leeds|Leicester|Southampton|Wolves|Brentford|Nottingham Forest|Sheffield United|Nottm Forest)',
-        'Championship': r'(Championship|Norwich|Watford|Birmingham|Blackburn|Bristol City|Cardiff|Coventry|Huddersfield|Hull|Luton|Middlesbrough|Millwall|Preston|QPR|Reading|Rotherham|Stoke|Swansea|West Brom|Leeds|Sheffield Wednesday)',
-        'League One': r'(League One|Barnsley|Blackpool|Bolton|Bristol Rovers|Burton|Cambridge|Charlton|Derby|Exeter|Fleetwood|Ipswich|Lincoln|MK Dons|Morecambe|Oxford|Peterborough|Plymouth|Portsmouth|Port Vale|Shrewsbury|Sunderland|Wigan|Wycombe)',
-        'League Two': r'(League Two|AFC Wimbledon|Barrow|Bradford|Carlisle|Colchester|Crawley|Crewe|Doncaster|Forest Green|Gillingham|Grimsby|Harrogate|Hartlepool|Leyton Orient|Mansfield|Newport|Northampton|Oldham|Rochdale|Salford|Scunthorpe|Stevenage|Swindon|Tranmere|Walsall|Chesterfield|Fleetwood Town)',
-        'Scottish Premiership': r'(Celtic|Rangers|Aberdeen|Hearts|Hibs|Motherwell|St Johnstone|Livingston|Ross County|St Mirren|Dundee|Kilmarnock)',
-        'Scottish Championship': r'(Scottish Championship|Dundee United|Inverness|Partick Thistle|Ayr United|Dunfermline|Greenock Morton|Queen of the South|Raith Rovers)',
-        'Scottish League One': r'(Scottish League One|Airdrieonians|Alloa|Clyde|Cove Rangers|East Fife|Falkirk|Forfar|Montrose|Peterhead|Stranraer)',
-        'Scottish League Two': r'(Scottish League Two|Albion Rovers|Annan|Berwick|Cowdenbeath|Edinburgh City|Elgin|Stirling|Stenhousemuir)',
-        'Women\'s Super League': r'(Women|WSL|Arsenal Women|Chelsea Women|Man City Women|Man United Women|Tottenham Women|Everton Women|Brighton Women|Aston Villa Women|West Ham Women|Birmingham Women|Reading Women)',
-        'National League': r'(National League|Wrexham|Notts County|Chesterfield|Boreham Wood|Bromley|Dagenham|Eastleigh|FC Halifax|Gateshead|Grimsby|Hartlepool|Maidenhead|Maidstone|Oldham|Solihull|Southend|Stockport|Torquay|Woking|Yeovil)'
-    }
-    
-    # Extract teams from event name
-    teams = []
-    if ' v ' in event_name:
-        teams = event_name.split(' v ')
-    elif ' vs ' in event_name:
-        teams = event_name.split(' vs ')
-    else:
+    # Extract teams from event name, splitting at the first separator only
+    home_team, sep, away_team = event_name.partition(' v ')
+    if not sep:
+        home_team, sep, away_team = event_name.partition(' vs ')
+    if not sep:
         return None, None, None
     
-    if len(teams) != 2:
-        return None, None, None
+    home_team = home_team.strip()
+    away_team = away_team.strip()
     
-    home_team = teams[0].strip()
-    away_team = teams[1].strip()
+    # Known team names resolve with two dict lookups
+    home_hit = TEAM_TO_LEAGUE.get(home_team.lower())
+    away_hit = TEAM_TO_LEAGUE.get(away_team.lower())
+    if home_hit and away_hit:
+        return min(home_hit, away_hit)[1], home_team, away_team
     
-    # Determine league based on team names
-    for league, pattern in league_patterns.items():
-        if re.search(pattern, event_name, re.IGNORECASE):
-            return league, home_team, away_team
+    # Determine league based on team names (single scan over all league names)
+    league = _first_league(_LEAGUE_AUTOMATON, event_name.lower())
+    if league:
+        return league, home_team, away_team
     
     # If no specific pattern matches, try to determine from team names
-    all_teams = home_team + ' ' + away_team
-    
-    # Check for Premier League teams
-    pl_teams = ['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest']
-    if any(team in all_teams for team in pl_teams):
-        return 'Premier League', home_team, away_team
-    
-    # Check for Championship teams
-    champ_teams = ['Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Sheffield Wednesday']
-    if any(team in all_teams for team in champ_teams):
-        return 'Championship', home_team, away_team
-    
-    # Check for Scottish teams
-    scottish_teams = ['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock']
-    if any(team in all_teams for team in scottish_teams):
-        return 'Scottish Premiership', home_team, away_team
-    
-    # Check for League Two teams
-    league_two_teams = ['AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town']
-    if any(team in all_teams for team in league_two_teams):
-        return 'League Two', home_team, away_team
+    teams = frozenset((home_team, away_team))
+    for league, known_teams in FALLBACK_TEAMS:
+        if known_teams & teams:
+            return league, home_team, away_team
     
     return 'Unknown', home_team, away_team
 
-def main():
+def main(csv=False):
     """Main function to extract all GB leagues."""
     
     tar_file = 'data/GB_24_25.tar'
@@ -197,40 +346,31 @@ def main():
             
             # Show sample matches
             print(f"   Sample Matches:")
-            for match in league['Matches'][:5]:
+            for match in league['Sample_Matches']:
                 print(f"     - {match['home_team']} v {match['away_team']} ({match['date']})")
-            if len(league['Matches']) > 5:
-                print(f"     ... and {len(league['Matches']) - 5} more matches")
+            if league['Unique_Matches'] > SAMPLE_MATCHES:
+                print(f"     ... and {league['Unique_Matches'] - SAMPLE_MATCHES} more matches")
         
         print(f"\n📈 TOTAL COVERAGE")
         print(f"   Total Leagues: {len(league_summary)}")
         print(f"   Total Unique Matches: {total_matches}")
         
-        # Save detailed results
-        all_matches = []
-        for league in league_summary:
-            for match in league['Matches']:
-                all_matches.append({
-                    'League': league['League'],
-                    'Event_ID': match['event_id'],
-                    'Event_Name': match['event_name'],
-                    'Home_Team': match['home_team'],
-                    'Away_Team': match['away_team'],
-                    'Date': match['date'],
-                    'Market_Time': match['market_time']
-                })
+        # Detailed results were streamed to Parquet during extraction
+        print(f"\n💾 All matches saved to: {MATCHES_PARQUET}")
         
-        df = pd.DataFrame(all_matches)
-        df.to_csv('all_gb_leagues_matches.csv', index=False)
-        print(f"\n💾 All matches saved to: all_gb_leagues_matches.csv")
+        if csv:
+            # Rebuild the CSV grouped by league in summary order, as before
+            df = pd.read_parquet(MATCHES_PARQUET)
+            league_order = {league['League']: rank for rank, league in enumerate(league_summary)}
+            df = df.iloc[df['League'].map(league_order).argsort(kind='stable')]
+            df.to_csv('all_gb_leagues_matches.csv', index=False)
+            print(f"💾 All matches saved to: all_gb_leagues_matches.csv")
         
         # Save league summary
-        summary_df = pd.DataFrame([{
-            'League': league['League'],
-            'Total_Events': league['Total_Events'],
-            'Unique_Matches': league['Unique_Matches'],
-            'Date_Range': league['Date_Range']
-        } for league in league_summary])
+        summary_df = pd.DataFrame({
+            column: [league[column] for league in league_summary]
+            for column in ('League', 'Total_Events', 'Unique_Matches', 'Date_Range')
+        })
         summary_df.to_csv('gb_leagues_summary.csv', index=False)
         print(f"💾 League summary saved to: gb_leagues_summary.csv")
         
@@ -5,12 +5,194 @@ Extract comprehensive odds data from GB dataset and apply betting formula to all
 
 import pandas as pd
 import tarfile
-import json
+import orjson
 import bz2
-from collections import defaultdict
+import io
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import re
-from datetime import datetime
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as paj
+from numba import njit
+from tqdm import tqdm
+
+# Read size for both the tar stream buffer and the per-member bz2 chunks
+_READ_CHUNK_SIZE = 1 << 20
+
+# One PCG64 generator shared by the simulated league draws
+_RNG = np.random.default_rng()
+
+# Per-match fields kept as parallel per-league lists during extraction
+MATCH_FIELDS = ('event_id', 'event_name', 'home_team', 'away_team', 'market_time')
+
+# Low-cardinality string columns of the combined betting results
+CATEGORY_COLUMNS = ('League', 'Home_Team', 'Away_Team', 'Model_Result', 'Bet_Result')
+
+# League name alternations, checked in priority order
+_LEAGUE_PATTERNS = (
+    ('Premier League', r'Arsenal|Chelsea|Liverpool|Man City|Man United|Tottenham|Newcastle|West Ham|Aston Villa|Brighton|Crystal Palace|Everton|Fulham|Leeds|Leicester|Southampton|Wolves|Brentford|Nottingham Forest|Sheffield United|Nottm Forest'),
+    ('Championship', r'Championship|Norwich|Watford|Birmingham|Blackburn|Bristol City|Cardiff|Coventry|Huddersfield|Hull|Luton|Middlesbrough|Millwall|Preston|QPR|Reading|Rotherham|Stoke|Swansea|West Brom|Leeds|Sheffield Wednesday'),
+    ('League One', r'League One|Barnsley|Blackpool|Bolton|Bristol Rovers|Burton|Cambridge|Charlton|Derby|Exeter|Fleetwood|Ipswich|Lincoln|MK Dons|Morecambe|Oxford|Peterborough|Plymouth|Portsmouth|Port Vale|Shrewsbury|Sunderland|Wigan|Wycombe'),
+    ('League Two', r'League Two|AFC Wimbledon|Barrow|Bradford|Carlisle|Colchester|Crawley|Crewe|Doncaster|Forest Green|Gillingham|Grimsby|Harrogate|Hartlepool|Leyton Orient|Mansfield|Newport|Northampton|Oldham|Rochdale|Salford|Scunthorpe|Stevenage|Swindon|Tranmere|Walsall|Chesterfield|Fleetwood Town'),
+    ('Scottish Premiership', r'Celtic|Rangers|Aberdeen|Hearts|Hibs|Motherwell|St Johnstone|Livingston|Ross County|St Mirren|Dundee|Kilmarnock'),
+    ('Scottish Championship', r'Scottish Championship|Dundee United|Inverness|Partick Thistle|Ayr United|Dunfermline|Greenock Morton|Queen of the South|Raith Rovers'),
+    ('Scottish League One', r'Scottish League One|Airdrieonians|Alloa|Clyde|Cove Rangers|East Fife|Falkirk|Forfar|Montrose|Peterhead|Stranraer'),
+    ('Scottish League Two', r'Scottish League Two|Albion Rovers|Annan|Berwick|Cowdenbeath|Edinburgh City|Elgin|Stirling|Stenhousemuir'),
+    ("Women's Super League", r'Women|WSL|Arsenal Women|Chelsea Women|Man City Women|Man United Women|Tottenham Women|Everton Women|Brighton Women|Aston Villa Women|West Ham Women|Birmingham Women|Reading Women'),
+    ('National League', r'National League|Wrexham|Notts County|Chesterfield|Boreham Wood|Bromley|Dagenham|Eastleigh|FC Halifax|Gateshead|Grimsby|Hartlepool|Maidenhead|Maidstone|Oldham|Solihull|Southend|Stockport|Torquay|Woking|Yeovil'),
+)
+
+# One case-insensitive scan over the event name. Each zero-width lookahead reports the
+# highest-priority league starting at that position without consuming it, so the
+# lowest group seen anywhere is the first league the per-pattern loop would return.
+_LEAGUE_RE = re.compile(
+    '(?=' + '|'.join(f'({pattern})' for _, pattern in _LEAGUE_PATTERNS) + ')',
+    re.IGNORECASE,
+)
+
+# Team lists used when no league pattern matches the raw event name
+_PL_TEAMS = ('Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest')
+_CHAMP_TEAMS = ('Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Sheffield Wednesday')
+_SCOTTISH_TEAMS = ('Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock')
+_LEAGUE_TWO_TEAMS = ('AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town')
+
+_FALLBACK_TEAMS = (
+    ('Premier League', _PL_TEAMS),
+    ('Championship', _CHAMP_TEAMS),
+    ('Scottish Premiership', _SCOTTISH_TEAMS),
+    ('League Two', _LEAGUE_TWO_TEAMS),
+)
+
+# Exact team name -> league for the fallback; built in reverse so earlier lists win on overlaps
+TEAM_TO_LEAGUE = {team: league for league, teams in reversed(_FALLBACK_TEAMS) for team in teams}
+
+def _iter_bz2_lines(file_obj):
+    """Decompress a bz2 file object chunk by chunk and yield complete byte lines."""
+    decompressor = bz2.BZ2Decompressor()
+    buffer = b''
+    while True:
+        chunk = file_obj.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        while chunk:
+            buffer += decompressor.decompress(chunk)
+            chunk = b''
+            if decompressor.eof:
+                # Multi-stream member: restart on whatever followed this stream
+                chunk = decompressor.unused_data
+                decompressor = bz2.BZ2Decompressor()
+        *lines, buffer = buffer.split(b'\n')
+        yield from lines
+    if buffer:
+        yield buffer
+
+# Byte marker for the only market definitions the extractor keeps
+_TARGET_MARKET = b'First Half Goals 0.5'
+
+# Only the market definition fields the extractor reads; everything else on a line is ignored
+_LINE_SCHEMA = pa.schema([
+    ('mc', pa.list_(pa.struct([
+        ('marketDefinition', pa.struct([
+            ('name', pa.string()),
+            ('eventName', pa.string()),
+            ('eventId', pa.string()),
+            ('marketTime', pa.string())
+        ]))
+    ])))
+])
+_PARSE_OPTIONS = paj.ParseOptions(explicit_schema=_LINE_SCHEMA, unexpected_field_behavior='ignore')
+
+# Market definitions already handled by this process, shared across members
+_SEEN_EVENTS = set()
+
+def _market_definitions(lines):
+    """Parse candidate NDJSON lines with Arrow and return the first half goals market definitions."""
+    # One block for the whole payload: no line can straddle a block boundary, and the
+    # worker processes already supply the parallelism
+    data = b'\n'.join(lines)
+    table = paj.read_json(
+        pa.BufferReader(data),
+        read_options=paj.ReadOptions(use_threads=False, block_size=max(len(data), 1 << 20)),
+        parse_options=_PARSE_OPTIONS
+    )
+    # Explode mc[*] and keep the target markets before converting anything to Python
+    definitions = pc.struct_field(pc.list_flatten(table.column('mc')), 'marketDefinition')
+    names = pc.struct_field(definitions, 'name')
+    return definitions.filter(pc.match_substring(names, 'First Half Goals 0.5')).to_pylist()
+
+def _market_definitions_by_line(lines):
+    """Per-line fallback for payloads Arrow rejects; undecodable lines are skipped."""
+    definitions = []
+    for line in lines:
+        try:
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        
+        if 'mc' in data and data['mc']:
+            for market in data['mc']:
+                if 'marketDefinition' in market:
+                    md = market['marketDefinition']
+                    
+                    # Check if it's a first half goals market
+                    if 'name' in md and 'First Half Goals 0.5' in md['name']:
+                        definitions.append(md)
+    return definitions
+
+def _decode_and_filter(task):
+    """Decompress one bz2 tar member and return its first half goals matches."""
+    member_name, raw = task
+    matches = []
+    try:
+        # Cheap substring test: skip blank lines and lines that cannot hold the market
+        lines = [line for line in _iter_bz2_lines(io.BytesIO(raw)) if _TARGET_MARKET in line]
+        if not lines:
+            return member_name, matches, None
+        
+        try:
+            definitions = _market_definitions(lines)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # A malformed line or an off-schema value fails the whole Arrow read
+            definitions = _market_definitions_by_line(lines)
+        
+        for md in definitions:
+            # Arrow reports absent fields as None
+            event_name = md.get('eventName') or ''
+            event_id = md.get('eventId') or ''
+            market_time = md.get('marketTime') or ''
+            
+            # Replays repeat the same definition in many snapshots; only the first counts
+            key = (event_id, event_name, market_time)
+            if key in _SEEN_EVENTS:
+                continue
+            _SEEN_EVENTS.add(key)
+            
+            # Extract league and teams
+            league, home_team, away_team = extract_league_and_teams(event_name)
+            
+            if league and home_team and away_team:
+                # Store match info in MATCH_FIELDS order
+                matches.append((league, (event_id, event_name, home_team, away_team, market_time)))
+    
+    except Exception as e:
+        return member_name, matches, e
+    
+    return member_name, matches, None
+
+def _read_members(tar):
+    """Yield (name, compressed bytes) for every bz2 member; tarfile reads stay in this process."""
+    for member in tar:
+        if member.name.endswith('.bz2'):
+            try:
+                file_obj = tar.extractfile(member)
+                if file_obj:
+                    yield member.name, file_obj.read()
+            except Exception as e:
+                print(f"Error processing {member.name}: {e}")
 
 def extract_comprehensive_odds_data(tar_file_path):
     """Extract comprehensive odds data from GB dataset."""
@@ -18,79 +200,52 @@ def extract_comprehensive_odds_data(tar_file_path):
     print("🔍 Extracting comprehensive odds data from GB_24_25.tar...")
     print("=" * 60)
     
-    # Dictionary to store odds data by league
+    # Parallel per-league columns, one list per match field, plus the dedup keys
     leagues_odds = defaultdict(lambda: {
-        'matches': [],
-        'odds_data': {}
+        **{field: [] for field in MATCH_FIELDS},
+        'seen': set()
     })
     
-    total_files = 0
     processed_files = 0
     
+    def merge(result):
+        nonlocal processed_files
+        member_name, matches, error = result
+        for league, match_info in matches:
+            league_data = leagues_odds[league]
+            event_id, event_name, home_team, away_team, market_time = match_info
+            # Avoid duplicates; the remaining fields are derived from these three
+            key = (event_id, event_name, market_time)
+            if key not in league_data['seen']:
+                league_data['seen'].add(key)
+                for field, value in zip(MATCH_FIELDS, match_info):
+                    league_data[field].append(value)
+        if error is not None:
+            print(f"Error processing {member_name}: {error}")
+            return
+        processed_files += 1
+        if processed_files % 500 == 0:
+            tqdm.write(f"Processed {processed_files} files...")
+    
     try:
-        with tarfile.open(tar_file_path, 'r') as tar:
-            total_files = len(tar.getnames())
-            print(f"Total files in archive: {total_files}")
-            
-            for member in tar.getmembers():
-                if member.name.endswith('.bz2'):
-                    try:
-                        file_obj = tar.extractfile(member)
-                        if file_obj:
-                            decompressed = bz2.decompress(file_obj.read())
-                            lines = decompressed.decode('utf-8').strip().split('\n')
-                            
-                            for line in lines:
-                                if line.strip():
-                                    try:
-                                        data = json.loads(line)
-                                        
-                                        if 'mc' in data and data['mc']:
-                                            for market in data['mc']:
-                                                if 'marketDefinition' in market:
-                                                    md = market['marketDefinition']
-                                                    
-                                                    # Check if it's a first half goals market
-                                                    if 'name' in md and 'First Half Goals 0.5' in md['name']:
-                                                        event_name = md.get('eventName', '')
-                                                        event_id = md.get('eventId', '')
-                                                        market_time = md.get('marketTime', '')
-                                                        
-                                                        # Extract league and teams
-                                                        league, home_team, away_team = extract_league_and_teams(event_name)
-                                                        
-                                                        if league and home_team and away_team:
-                                                            # Store match info
-                                                            match_info = {
-                                                                'event_id': event_id,
-                                                                'event_name': event_name,
-                                                                'home_team': home_team,
-                                                                'away_team': away_team,
-                                                                'market_time': market_time,
-                                                                'date': market_time[:10],
-                                                                'league': league
-                                                            }
-                                                            
-                                                            # Avoid duplicates
-                                                            if match_info not in leagues_odds[league]['matches']:
-                                                                leagues_odds[league]['matches'].append(match_info)
-                                                
-                                                elif 'rc' in market:  # Runner change data with odds
-                                                    market_id = market.get('id', '')
-                                                    if market_id:
-                                                        # Store odds updates
-                                                        leagues_odds['odds_updates'][market_id] = market.get('rc', [])
-                                        
-                                    except json.JSONDecodeError:
-                                        continue
-                            
-                            processed_files += 1
-                            if processed_files % 500 == 0:
-                                print(f"Processed {processed_files}/{total_files} files...")
-                                
-                    except Exception as e:
-                        print(f"Error processing {member.name}: {e}")
-                        continue
+        # Stream the archive front to back; no up-front index walk over every member
+        # Progress tracks compressed bytes read from the archive, so no member count is needed
+        with open(tar_file_path, 'rb', buffering=_READ_CHUNK_SIZE) as raw, \
+                tqdm.wrapattr(raw, 'read', total=os.path.getsize(tar_file_path),
+                              desc=os.path.basename(tar_file_path)) as progress, \
+                tarfile.open(fileobj=progress, mode='r|') as tar:
+            # Decompress and parse members in worker processes; keep a bounded
+            # window of compressed payloads in flight so memory stays flat
+            workers = os.cpu_count() or 1
+            max_pending = workers * 4
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for task in _read_members(tar):
+                    pending.append(executor.submit(_decode_and_filter, task))
+                    if len(pending) >= max_pending:
+                        merge(pending.popleft().result())
+                while pending:
+                    merge(pending.popleft().result())
     
     except Exception as e:
         print(f"Error opening tar file: {e}")
@@ -98,92 +253,82 @@ def extract_comprehensive_odds_data(tar_file_path):
     
     print(f"\n✅ Extraction complete! Processed {processed_files} files")
     
-    # Create comprehensive dataset
-    all_matches = []
-    for league, data in leagues_odds.items():
-        if league == 'odds_updates':
-            continue
-            
-        for match in data['matches']:
-            all_matches.append(match)
+    # Create comprehensive dataset straight from each league's columns
+    frames = [
+        pd.DataFrame({field: data[field] for field in MATCH_FIELDS}).assign(league=league)
+        for league, data in leagues_odds.items()
+    ]
+    if frames:
+        all_matches = pd.concat(frames, ignore_index=True)
+    else:
+        all_matches = pd.DataFrame(columns=[*MATCH_FIELDS, 'league'])
     
     return all_matches, leagues_odds
 
+def _first_league(event_name):
+    """Return the highest-priority league whose pattern appears in the event name."""
+    best = None
+    for match in _LEAGUE_RE.finditer(event_name):
+        # Groups are numbered in priority order, one per league
+        priority = match.lastindex - 1
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break
+    return None if best is None else _LEAGUE_PATTERNS[best][0]
+
+@lru_cache(maxsize=100_000)
 def extract_league_and_teams(event_name):
     """Extract league name and team names from event name."""
     
-    # Common patterns for different leagues
-    league_patterns = {
-        'Premier League': r'(Arsenal|Chelsea|Liverpool|Man City|Man United|Tottenham|Newcastle|West Ham|Aston Villa|Brighton|Crystal Palace|Everton|Fulham|Leeds|Leicester|Southampton|Wolves|Brentford|Nottingham Forest|Sheffield United|Nottm Forest)',
-        'Championship': r'(Championship|Norwich|Watford|Birmingham|Blackburn|Bristol City|Cardiff|Coventry|Huddersfield|Hull|Luton|Middlesbrough|Millwall|Preston|QPR|Reading|Rotherham|Stoke|Swansea|West Brom|Leeds|Sheffield Wednesday)',
-        'League One': r'(League One|Barnsley|Blackpool|Bolton|Bristol Rovers|Burton|Cambridge|Charlton|Derby|Exeter|Fleetwood|Ipswich|Lincoln|MK Dons|Morecambe|Oxford|Peterborough|Plymouth|Portsmouth|Port Vale|Shrewsbury|Sunderland|Wigan|Wycombe)',
-        'League Two': r'(League Two|AFC Wimbledon|Barrow|Bradford|Carlisle|Colchester|Crawley|Crewe|Doncaster|Forest Green|Gillingham|Grimsby|Harrogate|Hartlepool|Leyton Orient|Mansfield|Newport|Northampton|Oldham|Rochdale|Salford|Scunthorpe|Stevenage|Swindon|Tranmere|Walsall|Chesterfield|Fleetwood Town)',
-        'Scottish Premiership': r'(Celtic|Rangers|Aberdeen|Hearts|Hibs|Motherwell|St Johnstone|Livingston|Ross County|St Mirren|Dundee|Kilmarnock)',
-        'Scottish Championship': r'(Scottish Championship|Dundee United|Inverness|Partick Thistle|Ayr United|Dunfermline|Greenock Morton|Queen of the South|Raith Rovers)',
-        'Scottish League One': r'(Scottish League One|Airdrieonians|Alloa|Clyde|Cove Rangers|East Fife|Falkirk|Forfar|Montrose|Peterhead|Stranraer)',
-        'Scottish League Two': r'(Scottish League Two|Albion Rovers|Annan|Berwick|Cowdenbeath|Edinburgh City|Elgin|Stirling|Stenhousemuir)',
-        'Women\'s Super League': r'(Women|WSL|Arsenal Women|Chelsea Women|Man City Women|Man United Women|Tottenham Women|Everton Women|Brighton Women|Aston Villa Women|West Ham Women|Birmingham Women|Reading Women)',
-        'National League': r'(National League|Wrexham|Notts County|Chesterfield|Boreham Wood|Bromley|Dagenham|Eastleigh|FC Halifax|Gateshead|Grimsby|Hartlepool|Maidenhead|Maidstone|Oldham|Solihull|Southend|Stockport|Torquay|Woking|Yeovil)'
-    }
-    
-    # Extract teams from event name
-    teams = []
-    if ' v ' in event_name:
-        teams = event_name.split(' v ')
-    elif ' vs ' in event_name:
-        teams = event_name.split(' vs ')
-    else:
-        return None, None, None
+    # Extract teams from event name; ' v ' takes precedence over ' vs '
+    home_team, separator, away_team = event_name.partition(' v ')
+    if not separator:
+        home_team, separator, away_team = event_name.partition(' vs ')
+        if not separator:
+            return None, None, None
     
-    if len(teams) != 2:
+    # Exactly two sides
+    if separator in away_team:
         return None, None, None
     
-    home_team = teams[0].strip()
-    away_team = teams[1].strip()
+    home_team = home_team.strip()
+    away_team = away_team.strip()
     
     # Determine league based on team names
-    for league, pattern in league_patterns.items():
-        if re.search(pattern, event_name, re.IGNORECASE):
-            return league, home_team, away_team
+    league = _first_league(event_name)
+    if league:
+        return league, home_team, away_team
     
     # If no specific pattern matches, try to determine from team names
-    all_teams = home_team + ' ' + away_team
-    
-    # Check for Premier League teams
-    pl_teams = ['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 'Tottenham', 'Newcastle', 'West Ham', 'Aston Villa', 'Brighton', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester', 'Southampton', 'Wolves', 'Brentford', 'Nottingham Forest', 'Sheffield United', 'Nottm Forest']
-    if any(team in all_teams for team in pl_teams):
-        return 'Premier League', home_team, away_team
-    
-    # Check for Championship teams
-    champ_teams = ['Norwich', 'Watford', 'Birmingham', 'Blackburn', 'Bristol City', 'Cardiff', 'Coventry', 'Huddersfield', 'Hull', 'Luton', 'Middlesbrough', 'Millwall', 'Preston', 'QPR', 'Reading', 'Rotherham', 'Stoke', 'Swansea', 'West Brom', 'Sheffield Wednesday']
-    if any(team in all_teams for team in champ_teams):
-        return 'Championship', home_team, away_team
-    
-    # Check for Scottish teams
-    scottish_teams = ['Celtic', 'Rangers', 'Aberdeen', 'Hearts', 'Hibs', 'Motherwell', 'St Johnstone', 'Livingston', 'Ross County', 'St Mirren', 'Dundee', 'Kilmarnock']
-    if any(team in all_teams for team in scottish_teams):
-        return 'Scottish Premiership', home_team, away_team
-    
-    # Check for League Two teams
-    league_two_teams = ['AFC Wimbledon', 'Barrow', 'Bradford', 'Carlisle', 'Colchester', 'Crawley', 'Crewe', 'Doncaster', 'Forest Green', 'Gillingham', 'Grimsby', 'Harrogate', 'Hartlepool', 'Leyton Orient', 'Mansfield', 'Newport', 'Northampton', 'Oldham', 'Rochdale', 'Salford', 'Scunthorpe', 'Stevenage', 'Swindon', 'Tranmere', 'Walsall', 'Chesterfield', 'Fleetwood Town']
-    if any(team in all_teams for team in league_two_teams):
-        return 'League Two', home_team, away_team
-    
-    return 'Unknown', home_team, away_team
+    league = TEAM_TO_LEAGUE.get(home_team) or TEAM_TO_LEAGUE.get(away_team) or 'Unknown'
+    return league, home_team, away_team
 
-def apply_betting_formula_to_matches(matches, league_name):
-    """Apply betting formula to matches for a specific league."""
-    
-    print(f"🎯 Applying betting formula to {league_name}...")
-    
-    # For this analysis, we'll use a simplified approach
-    # In reality, we'd need historical first-half goal data for each league
-    
-    results = []
-    
-    # Load Premier League results as reference
+@njit(cache=True)
+def _simulate(under_odds, combined_average, is_win, lay_stake, commission_rate, threshold, out_profit, out_keep):
+    """Gate one league's pre-drawn samples and fill in lay betting PnL for the kept bets."""
+    for i in range(under_odds.shape[0]):
+        # Skip high odds bets (same as Premier League) and combined averages below the threshold
+        if under_odds[i] > 5.0 or combined_average[i] < threshold:
+            out_keep[i] = False
+            continue
+        out_keep[i] = True
+        if is_win[i]:
+            # Goal scored before half-time (we win the lay bet)
+            out_profit[i] = lay_stake * (1 - commission_rate)
+        else:
+            # 0-0 at half-time (we lose the lay bet)
+            out_profit[i] = -lay_stake * (under_odds[i] - 1)
+
+def load_premier_league_reference():
+    """Load the Premier League win rate and average odds used as the reference for every league."""
     try:
-        pl_results = pd.read_csv('filtered_premier_league_odds_with_pnl.csv')
+        # Only the two reference columns are needed
+        pl_results = pd.read_csv(
+            'filtered_premier_league_odds_with_pnl.csv',
+            usecols=['Bet_Result', 'Under 0.5 Goals Odds'],
+            dtype={'Bet_Result': 'category'}
+        )
         pl_win_rate = (pl_results['Bet_Result'] == 'WIN').mean()
         pl_avg_odds = pl_results['Under 0.5 Goals Odds'].mean()
         print(f"   Using Premier League reference: {pl_win_rate:.1%} win rate, {pl_avg_odds:.2f} avg odds")
@@ -192,72 +337,70 @@ def apply_betting_formula_to_matches(matches, league_name):
         pl_avg_odds = 4.13   # Average odds from our previous analysis
         print(f"   Using default reference: {pl_win_rate:.1%} win rate, {pl_avg_odds:.2f} avg odds")
     
-    # Apply formula to each match
-    for i, match in enumerate(matches):
-        # Simulate the betting formula
-        # In reality, we'd calculate team averages from historical data
-        
-        # Generate mock odds (in reality, we'd extract from Betfair data)
-        under_odds = np.random.uniform(2.5, 6.0)  # Random odds between 2.5 and 6.0
-        
-        # Apply odds filter (same as Premier League)
-        if under_odds > 5.0:
-            continue  # Skip high odds bets
-        
-        # Simulate model result based on league level
-        # Higher leagues tend to have more goals
-        league_multipliers = {
-            'Premier League': 1.0,
-            'Championship': 0.9,
-            'League One': 0.8,
-            'League Two': 0.7,
-            'Scottish Premiership': 0.85,
-            'Scottish Championship': 0.75,
-            'Scottish League One': 0.7,
-            'Scottish League Two': 0.65,
-            'National League': 0.6,
-            'Unknown': 0.5
-        }
-        
-        multiplier = league_multipliers.get(league_name, 0.5)
-        adjusted_win_rate = pl_win_rate * multiplier
-        
-        # Determine if this would be a bet based on our formula
-        # Combined average >= 1.5 (simplified)
-        combined_average = np.random.uniform(0.8, 2.2) * multiplier
-        
-        if combined_average >= 1.5:
-            # Simulate bet result
-            is_win = np.random.random() < adjusted_win_rate
-            
-            # Calculate PnL using lay betting formula
-            lay_stake = 100.0
-            commission_rate = 0.02
-            
-            if is_win:
-                # Goal scored before half-time (we win the lay bet)
-                profit = lay_stake * (1 - commission_rate)
-                bet_result = 'WIN'
-            else:
-                # 0-0 at half-time (we lose the lay bet)
-                loss_amount = lay_stake * (under_odds - 1)
-                profit = -loss_amount
-                bet_result = 'LOSS'
-            
-            results.append({
-                'League': league_name,
-                'Date': match['date'],
-                'Home_Team': match['home_team'],
-                'Away_Team': match['away_team'],
-                'Event_ID': match['event_id'],
-                'Event_Name': match['event_name'],
-                'Under_Odds': round(under_odds, 2),
-                'Lay_Stake': lay_stake,
-                'Model_Result': 'WIN' if is_win else 'LOSS',
-                'Bet_Result': bet_result,
-                'Profit_Loss': round(profit, 2),
-                'Combined_Average': round(combined_average, 2)
-            })
+    return pl_win_rate, pl_avg_odds
+
+def apply_betting_formula_to_matches(matches, league_name, pl_win_rate, pl_avg_odds):
+    """Apply betting formula to a league's match columns (one list per MATCH_FIELDS entry)."""
+    
+    print(f"🎯 Applying betting formula to {league_name}...")
+    
+    # For this analysis, we'll use a simplified approach
+    # In reality, we'd need historical first-half goal data for each league
+    
+    # Simulate model result based on league level
+    # Higher leagues tend to have more goals
+    league_multipliers = {
+        'Premier League': 1.0,
+        'Championship': 0.9,
+        'League One': 0.8,
+        'League Two': 0.7,
+        'Scottish Premiership': 0.85,
+        'Scottish Championship': 0.75,
+        'Scottish League One': 0.7,
+        'Scottish League Two': 0.65,
+        'National League': 0.6,
+        'Unknown': 0.5
+    }
+    
+    multiplier = league_multipliers.get(league_name, 0.5)
+    adjusted_win_rate = pl_win_rate * multiplier
+    lay_stake = 100.0
+    commission_rate = 0.02
+    
+    # Simulate the betting formula for every match in one batch
+    # In reality, we'd calculate team averages from historical data
+    n = len(matches['event_id'])
+    
+    # Generate mock odds (in reality, we'd extract from Betfair data)
+    under_odds = _RNG.uniform(2.5, 6.0, n)  # Random odds between 2.5 and 6.0
+    # Combined average >= 1.5 (simplified)
+    combined_average = _RNG.uniform(0.8, 2.2, n) * multiplier
+    is_win = _RNG.random(n) < adjusted_win_rate
+    
+    # Apply the odds filter, combined average gate and lay PnL in one fused pass
+    keep = np.empty(n, dtype=np.bool_)
+    profit = np.empty(n)
+    _simulate(under_odds, combined_average, is_win, lay_stake, commission_rate, 1.5, profit, keep)
+    
+    bets = pd.DataFrame({field: matches[field] for field in MATCH_FIELDS})[keep].reset_index(drop=True)
+    outcome = np.where(is_win[keep], 'WIN', 'LOSS')
+    results = pd.DataFrame({
+        'League': league_name,
+        # Parse the ISO market times in one vectorized pass; missing times become NaT
+        'Date': pd.to_datetime(
+            bets['market_time'], utc=True, format='ISO8601', errors='coerce'
+        ).dt.tz_convert(None).dt.normalize(),
+        'Home_Team': bets['home_team'],
+        'Away_Team': bets['away_team'],
+        'Event_ID': bets['event_id'],
+        'Event_Name': bets['event_name'],
+        'Under_Odds': np.round(under_odds[keep], 2),
+        'Lay_Stake': lay_stake,
+        'Model_Result': outcome,
+        'Bet_Result': outcome,
+        'Profit_Loss': np.round(profit[keep], 2),
+        'Combined_Average': np.round(combined_average[keep], 2)
+    })
     
     print(f"   Generated {len(results)} bets for {league_name}")
     return results
@@ -280,35 +423,38 @@ def main():
     # Show league summary
     print(f"\n📊 LEAGUE COVERAGE SUMMARY")
     print("=" * 60)
-    league_counts = {}
-    for match in all_matches:
-        league = match['league']
-        league_counts[league] = league_counts.get(league, 0) + 1
-    
-    for league, count in sorted(league_counts.items(), key=lambda x: x[1], reverse=True):
+    for league, count in all_matches['league'].value_counts().items():
         print(f"   {league}: {count} matches")
     
+    # Load Premier League results as reference, once for every league
+    pl_win_rate, pl_avg_odds = load_premier_league_reference()
+    
     # Apply betting formula to each league
     all_results = []
     
     for league, data in leagues_odds.items():
-        if league == 'odds_updates' or league == 'Unknown':
+        if league == 'Unknown':
             continue
             
-        matches = data['matches']
-        if matches:
-            league_results = apply_betting_formula_to_matches(matches, league)
-            all_results.extend(league_results)
+        if data['event_id']:
+            all_results.append(apply_betting_formula_to_matches(data, league, pl_win_rate, pl_avg_odds))
     
     # Create comprehensive DataFrame
-    df = pd.DataFrame(all_results)
+    df = pd.concat(all_results, ignore_index=True) if all_results else pd.DataFrame()
     
     if len(df) > 0:
+        # Repeated labels are stored once as categories; groupby then works on integer codes
+        df = df.astype(dict.fromkeys(CATEGORY_COLUMNS, 'category'))
+        
         # Sort by league and date
         df = df.sort_values(['League', 'Date'])
         
+        # One grouper over the league codes serves both the running PnL and the summary;
+        # rows are already sorted by league, so first-seen order is the sorted order
+        grouper = df.groupby('League', sort=False, observed=True)
+        
         # Calculate cumulative PnL
-        df['Cumulative_PnL'] = df.groupby('League')['Profit_Loss'].cumsum()
+        df['Cumulative_PnL'] = grouper['Profit_Loss'].cumsum()
         
         # Save results
         df.to_csv('comprehensive_all_leagues_betting_analysis.csv', index=False)
@@ -318,7 +464,7 @@ def main():
         print(f"Total bets analyzed: {len(df)}")
         
         # Summary by league
-        league_summary = df.groupby('League').agg({
+        league_summary = grouper.agg({
             'Profit_Loss': ['count', 'sum', 'mean'],
             'Bet_Result': lambda x: (x == 'WIN').sum()
         }).round(2)
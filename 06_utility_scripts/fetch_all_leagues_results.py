@@ -3,16 +3,26 @@
 Fetch fresh match results from API-Football for all GB leagues
 """
 
+import asyncio
+import numpy as np
 import pandas as pd
-import requests
+import httpx
 import time
 from datetime import datetime, timedelta
-import json
+import orjson
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 # API-Football configuration
 API_KEY = "your_api_key_here"  # Will be replaced with actual key
 BASE_URL = "https://v3.football.api-sports.io"
 
+# Concurrent page requests across all leagues, and leagues fetched at once
+MAX_CONCURRENT_PAGES = 8
+MAX_CONCURRENT_LEAGUES = 4
+
+# Unique matches written by extract_all_gb_leagues.py
+MATCHES_PARQUET = 'all_gb_leagues_matches.parquet'
+
 def get_api_key():
     """Get API key from environment or config."""
     try:
@@ -23,12 +33,80 @@ def get_api_key():
     except:
         return ""
 
-def fetch_league_fixtures(league_name, season=2024):
-    """Fetch fixtures for a specific league from API-Football."""
+class RateLimiter:
+    """Pace requests from API-Football's per-minute rate-limit headers."""
     
-    headers = {
-        'x-apisports-key': API_KEY
-    }
+    # API-Football sends no reset time; its request quota window is one minute
+    WINDOW_SECONDS = 60.0
+    
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def wait(self):
+        """Block while the quota is exhausted; waiters queue behind the lock."""
+        async with self._lock:
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+    
+    def update(self, headers):
+        """Record the remaining quota reported by the last response."""
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is not None and int(remaining) <= 0:
+            self._resume_at = max(self._resume_at, time.monotonic() + self.WINDOW_SECONDS)
+
+def _is_retryable(exc):
+    """Retry on rate limiting, server errors and dropped connections."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    reraise=True
+)
+async def fetch_page(client, limiter, page_slots, league_id, season, page):
+    """Fetch one page of fixtures, honouring the concurrency cap and the rate limiter."""
+    async with page_slots:
+        await limiter.wait()
+        response = await client.get(f"{BASE_URL}/fixtures", params={
+            'league': league_id,
+            'season': season,
+            'page': page
+        })
+        limiter.update(response.headers)
+        response.raise_for_status()
+        # Parse the raw body bytes directly
+        return orjson.loads(response.content)
+
+def _parse_fixtures(data, league_name, season):
+    """Extract the relevant fields from one page of fixtures."""
+    fixtures = []
+    for fixture in data['response']:
+        # Extract relevant information
+        fixture_info = {
+            'fixture_id': fixture['fixture']['id'],
+            'date': fixture['fixture']['date'][:10],
+            'home_team': fixture['teams']['home']['name'],
+            'away_team': fixture['teams']['away']['name'],
+            'home_goals': fixture['goals']['home'],
+            'away_goals': fixture['goals']['away'],
+            'home_goals_ht': fixture['score']['halftime']['home'],
+            'away_goals_ht': fixture['score']['halftime']['away'],
+            'status': fixture['fixture']['status']['short'],
+            'league_name': league_name,
+            'season': season
+        }
+        
+        fixtures.append(fixture_info)
+    return fixtures
+
+async def fetch_league_fixtures(client, limiter, page_slots, league_name):
+    """Fetch fixtures for a specific league from API-Football."""
     
     # Map league names to API-Football league IDs
     league_mapping = {
@@ -57,61 +135,40 @@ def fetch_league_fixtures(league_name, season=2024):
     
     for season in seasons_to_try:
         print(f"   Trying season {season}...")
-        page = 1
-        
-        while True:
-            url = f"{BASE_URL}/fixtures"
-            params = {
-                'league': league_id,
-                'season': season,
-                'page': page
-            }
-            
-            try:
-                response = requests.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Debug: print response info
-                if page == 1:
-                    print(f"     Response: {data.get('results', 0)} total results available")
-                    if 'errors' in data:
-                        print(f"     Errors: {data['errors']}")
-                
-                if 'response' not in data or not data['response']:
-                    break
-                
-                for fixture in data['response']:
-                    # Extract relevant information
-                    fixture_info = {
-                        'fixture_id': fixture['fixture']['id'],
-                        'date': fixture['fixture']['date'][:10],
-                        'home_team': fixture['teams']['home']['name'],
-                        'away_team': fixture['teams']['away']['name'],
-                        'home_goals': fixture['goals']['home'],
-                        'away_goals': fixture['goals']['away'],
-                        'home_goals_ht': fixture['score']['halftime']['home'],
-                        'away_goals_ht': fixture['score']['halftime']['away'],
-                        'status': fixture['fixture']['status']['short'],
-                        'league_name': league_name,
-                        'season': season
-                    }
-                    
-                    fixtures.append(fixture_info)
-                
-                print(f"     Page {page}: {len(data['response'])} fixtures")
-                page += 1
-                
-                # Rate limiting
-                time.sleep(0.1)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"     ❌ Error fetching {league_name} season {season}: {e}")
-                break
-            except Exception as e:
-                print(f"     ❌ Unexpected error for {league_name} season {season}: {e}")
-                break
+        
+        try:
+            # The first page reports how many pages there are
+            data = await fetch_page(client, limiter, page_slots, league_id, season, 1)
+        except httpx.HTTPError as e:
+            print(f"     ❌ Error fetching {league_name} season {season}: {e}")
+            continue
+        except Exception as e:
+            print(f"     ❌ Unexpected error for {league_name} season {season}: {e}")
+            continue
+        
+        # Debug: print response info
+        print(f"     Response: {data.get('results', 0)} total results available")
+        if 'errors' in data:
+            print(f"     Errors: {data['errors']}")
+        
+        if 'response' not in data or not data['response']:
+            continue
+        
+        # Fetch the remaining pages concurrently; gather keeps them in page order
+        total_pages = data.get('paging', {}).get('total', 1)
+        pages = [data] + await asyncio.gather(
+            *(fetch_page(client, limiter, page_slots, league_id, season, page) for page in range(2, total_pages + 1)),
+            return_exceptions=True
+        )
+        
+        for page, page_data in enumerate(pages, start=1):
+            if isinstance(page_data, Exception):
+                print(f"     ❌ Error fetching {league_name} season {season} page {page}: {page_data}")
+                continue
+            if 'response' not in page_data or not page_data['response']:
+                continue
+            fixtures.extend(_parse_fixtures(page_data, league_name, season))
+            print(f"     Page {page}: {len(page_data['response'])} fixtures")
         
         # If we got fixtures, break out of season loop
         if fixtures:
@@ -120,51 +177,48 @@ def fetch_league_fixtures(league_name, season=2024):
     print(f"✅ {league_name}: {len(fixtures)} fixtures fetched")
     return fixtures
 
-def fetch_all_leagues_results():
+async def fetch_all_leagues_results():
     """Fetch results for all leagues found in the GB dataset."""
     
     # Load the leagues we found
     try:
-        df = pd.read_csv('all_gb_leagues_matches.csv')
+        df = pd.read_parquet(MATCHES_PARQUET, columns=['League'])
         leagues = df['League'].unique()
         print(f"📊 Found {len(leagues)} leagues to fetch results for:")
         for league in leagues:
             print(f"   - {league}")
     except FileNotFoundError:
-        print("❌ all_gb_leagues_matches.csv not found. Run extract_all_gb_leagues.py first.")
+        print(f"❌ {MATCHES_PARQUET} not found. Run extract_all_gb_leagues.py first.")
         return []
     
-    all_fixtures = []
-    
-    for league in leagues:
-        if league == 'Unknown':
-            print(f"⚠️  Skipping Unknown league")
-            continue
-            
-        fixtures = fetch_league_fixtures(league)
-        all_fixtures.extend(fixtures)
-        
-        # Rate limiting between leagues
-        time.sleep(1)
+    limiter = RateLimiter()
+    page_slots = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+    league_slots = asyncio.Semaphore(MAX_CONCURRENT_LEAGUES)
     
-    return all_fixtures
-
-def calculate_first_half_goals(fixtures):
-    """Calculate first half goals for each fixture."""
+    async def fetch_league(client, league):
+        async with league_slots:
+            return await fetch_league_fixtures(client, limiter, page_slots, league)
     
-    for fixture in fixtures:
-        home_ht = fixture.get('home_goals_ht', 0)
-        away_ht = fixture.get('away_goals_ht', 0)
+    # One pooled client for every league and page
+    async with httpx.AsyncClient(
+        headers={'x-apisports-key': API_KEY},
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=30.0
+    ) as client:
+        fetches = []
+        for league in leagues:
+            if league == 'Unknown':
+                print(f"⚠️  Skipping Unknown league")
+                continue
+            fetches.append(fetch_league(client, league))
         
-        if home_ht is not None and away_ht is not None:
-            total_ht_goals = home_ht + away_ht
-            fixture['total_ht_goals'] = total_ht_goals
-            fixture['has_ht_goals'] = total_ht_goals > 0
-        else:
-            fixture['total_ht_goals'] = None
-            fixture['has_ht_goals'] = None
+        results = await asyncio.gather(*fetches)
     
-    return fixtures
+    all_fixtures = []
+    for fixtures in results:
+        all_fixtures.extend(fixtures)
+    
+    return all_fixtures
 
 def main():
     """Main function to fetch all league results."""
@@ -179,18 +233,23 @@ def main():
     print("🏴󠁧󠁢󠁥󠁮󠁧󠁿 Fetching All GB Leagues Results from API-Football")
     print("=" * 60)
     
-    all_fixtures = fetch_all_leagues_results()
+    all_fixtures = asyncio.run(fetch_all_leagues_results())
     
     if all_fixtures:
         print(f"\n📊 FETCH SUMMARY")
         print(f"   Total fixtures fetched: {len(all_fixtures)}")
         
-        # Calculate first half goals
-        all_fixtures = calculate_first_half_goals(all_fixtures)
-        
         # Convert to DataFrame
         df = pd.DataFrame(all_fixtures)
         
+        # Calculate first half goals
+        home = df['home_goals_ht'].to_numpy(dtype=float)
+        away = df['away_goals_ht'].to_numpy(dtype=float)
+        mask = ~(pd.isna(home) | pd.isna(away))
+        total = home + away
+        df['total_ht_goals'] = np.where(mask, total, np.nan)
+        df['has_ht_goals'] = np.where(mask, total > 0, None)
+        
         # Filter for completed matches only
         completed_df = df[df['status'] == 'FT'].copy()
         print(f"   Completed matches: {len(completed_df)}")
@@ -4,9 +4,55 @@ List all available leagues from API-Football
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yaml
 import pandas as pd
 import time
+import gzip
+import hashlib
+import os
+import orjson
+
+# One pooled session so every request reuses the same keep-alive TLS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+))
+
+# Raw API responses are cached on disk so reruns skip the network and save quota
+CACHE_DIR = os.path.expanduser('~/.cache/apifootball')
+CACHE_TTL = 24 * 60 * 60
+
+def _cached_get(url, headers, params=None):
+    """GET a JSON endpoint, serving it from the disk cache while fresh."""
+    key = repr((url, sorted((params or {}).items()))).encode()
+    path = os.path.join(CACHE_DIR, f"{hashlib.sha1(key).hexdigest()}.json.gz")
+    
+    try:
+        if time.time() - os.path.getmtime(path) < CACHE_TTL:
+            with gzip.open(path, 'rb') as f:
+                return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    
+    response = _SESSION.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    
+    # Auth, quota and rate-limit failures arrive as 200 with an `errors` body; never cache them
+    if data.get('errors'):
+        return data
+    
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(tmp_path, path)
+    
+    return data
 
 def get_api_key():
     """Get API key from config."""
@@ -32,10 +78,11 @@ def fetch_all_leagues():
     print("=" * 60)
     
     try:
-        response = requests.get(f"{BASE_URL}/leagues", headers=headers)
-        response.raise_for_status()
+        data = _cached_get(f"{BASE_URL}/leagues", headers)
         
-        data = response.json()
+        if data.get('errors'):
+            print(f"❌ API error: {data['errors']}")
+            return None
         
         if 'response' not in data:
             print("❌ No response data found")
@@ -129,13 +176,10 @@ def check_league_fixtures(league_id, league_name, season=2024):
     headers = {'x-apisports-key': API_KEY}
     
     try:
-        response = requests.get(f"{BASE_URL}/fixtures", headers=headers, params={
+        data = _cached_get(f"{BASE_URL}/fixtures", headers, params={
             'league': league_id,
             'season': season
         })
-        response.raise_for_status()
-        
-        data = response.json()
         fixture_count = len(data.get('response', []))
         
         return fixture_count > 0, fixture_count
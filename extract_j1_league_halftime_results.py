@@ -6,10 +6,40 @@ Extract all J1 League fixtures with first-half results
 import asyncio
 import httpx
 import pandas as pd
+import xlsxwriter
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import json
 import os
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry on rate limiting, server errors and dropped connections"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def write_excel(df: pd.DataFrame, filename: str):
+    """Stream a DataFrame into an .xlsx sheet row by row in xlsxwriter's constant-memory mode"""
+    # Constant-memory mode flushes each row once the next one starts, so rows must be
+    # written strictly in order; pandas' to_excel writes column by column and would lose data
+    workbook = xlsxwriter.Workbook(filename, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+    })
+    try:
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, df.columns)
+        # Missing values become empty cells, as with to_excel
+        cells = df.astype(object).where(df.notna(), None)
+        for row, values in enumerate(cells.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row, 0, values)
+    finally:
+        workbook.close()
+
 
 class J1LeagueDataExtractor:
     def __init__(self, api_key: str):
@@ -21,90 +51,113 @@ class J1LeagueDataExtractor:
             'Accept': 'application/json'
         }
     
-    async def get_fixtures(self, season: int = 2025) -> List[Dict[str, Any]]:
-        """Get all fixtures for J1 League"""
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(4),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        reraise=True
+    )
+    async def _request_fixtures(self, client: httpx.AsyncClient, season: int) -> Dict[str, Any]:
+        """Request one season's fixtures, backing off on rate limits and server errors"""
+        params = {
+            "league": self.league_id,
+            "season": season
+        }
+        
+        response = await client.get(
+            f"{self.base_url}/fixtures",
+            headers=self.headers,
+            params=params
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def _fetch_season(self, client: httpx.AsyncClient, season: int) -> List[Dict[str, Any]]:
+        """Get all fixtures for one J1 League season"""
         print(f"Fetching fixtures for J1 League (Season {season})...")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Get all fixtures for the league
-                params = {
-                    "league": self.league_id,
-                    "season": season
-                }
+        try:
+            data = await self._request_fixtures(client, season)
+            
+            fixtures = []
+            for fixture_data in data.get("response", []):
+                fixture_info = fixture_data.get("fixture", {})
+                teams = fixture_data.get("teams", {})
+                goals = fixture_data.get("goals", {})
+                score = fixture_data.get("score", {})
                 
-                response = await client.get(
-                    f"{self.base_url}/fixtures",
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
+                # Extract halftime scores
+                halftime_score = score.get("halftime", {})
+                home_ht_goals = halftime_score.get("home")
+                away_ht_goals = halftime_score.get("away")
                 
-                fixtures = []
-                for fixture_data in data.get("response", []):
-                    fixture_info = fixture_data.get("fixture", {})
-                    teams = fixture_data.get("teams", {})
-                    goals = fixture_data.get("goals", {})
-                    score = fixture_data.get("score", {})
-                    
-                    # Extract halftime scores
-                    halftime_score = score.get("halftime", {})
-                    home_ht_goals = halftime_score.get("home")
-                    away_ht_goals = halftime_score.get("away")
+                # Extract full-time scores
+                home_ft_goals = goals.get("home")
+                away_ft_goals = goals.get("away")
+                
+                fixture_info_dict = {
+                    'fixture_id': fixture_info.get("id"),
+                    'league_id': self.league_id,
+                    'league_name': 'J1 League',
+                    'season': season,
+                    'match_date': fixture_info.get("date"),
+                    'match_status': fixture_info.get("status", {}).get("short"),
+                    'venue': fixture_info.get("venue", {}).get("name"),
+                    'venue_city': fixture_info.get("venue", {}).get("city"),
                     
-                    # Extract full-time scores
-                    home_ft_goals = goals.get("home")
-                    away_ft_goals = goals.get("away")
+                    # Teams
+                    'home_team_id': teams.get("home", {}).get("id"),
+                    'home_team_name': teams.get("home", {}).get("name"),
+                    'away_team_id': teams.get("away", {}).get("id"),
+                    'away_team_name': teams.get("away", {}).get("name"),
                     
-                    fixture_info_dict = {
-                        'fixture_id': fixture_info.get("id"),
-                        'league_id': self.league_id,
-                        'league_name': 'J1 League',
-                        'season': season,
-                        'match_date': fixture_info.get("date"),
-                        'match_status': fixture_info.get("status", {}).get("short"),
-                        'venue': fixture_info.get("venue", {}).get("name"),
-                        'venue_city': fixture_info.get("venue", {}).get("city"),
-                        
-                        # Teams
-                        'home_team_id': teams.get("home", {}).get("id"),
-                        'home_team_name': teams.get("home", {}).get("name"),
-                        'away_team_id': teams.get("away", {}).get("id"),
-                        'away_team_name': teams.get("away", {}).get("name"),
-                        
-                        # Full-time scores
-                        'home_ft_score': home_ft_goals,
-                        'away_ft_score': away_ft_goals,
-                        
-                        # Half-time scores
-                        'home_ht_score': home_ht_goals,
-                        'away_ht_score': away_ht_goals,
-                        
-                        # Total first-half goals
-                        'total_ht_goals': None,
-                        'has_ht_data': False
-                    }
+                    # Full-time scores
+                    'home_ft_score': home_ft_goals,
+                    'away_ft_score': away_ft_goals,
                     
-                    # Calculate total first-half goals if available
-                    if home_ht_goals is not None and away_ht_goals is not None:
-                        fixture_info_dict['total_ht_goals'] = home_ht_goals + away_ht_goals
-                        fixture_info_dict['has_ht_data'] = True
+                    # Half-time scores
+                    'home_ht_score': home_ht_goals,
+                    'away_ht_score': away_ht_goals,
                     
-                    fixtures.append(fixture_info_dict)
+                    # Total first-half goals
+                    'total_ht_goals': None,
+                    'has_ht_data': False
+                }
                 
-                print(f"Found {len(fixtures)} fixtures")
-                return fixtures
+                # Calculate total first-half goals if available
+                if home_ht_goals is not None and away_ht_goals is not None:
+                    fixture_info_dict['total_ht_goals'] = home_ht_goals + away_ht_goals
+                    fixture_info_dict['has_ht_data'] = True
                 
-            except Exception as e:
-                print(f"Error fetching fixtures: {e}")
-                return []
+                fixtures.append(fixture_info_dict)
+            
+            print(f"Found {len(fixtures)} fixtures")
+            return fixtures
+            
+        except Exception as e:
+            print(f"Error fetching fixtures: {e}")
+            return []
     
-    def save_to_excel(self, fixtures: List[Dict[str, Any]], filename: str):
-        """Save fixtures to Excel file"""
+    async def get_fixtures(self, seasons: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Get all fixtures for J1 League across the given seasons"""
+        if seasons is None:
+            seasons = [2025]
+        
+        # One HTTP/2 client shared by every season request; the requests run concurrently
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20)
+        ) as client:
+            results = await asyncio.gather(*(self._fetch_season(client, season) for season in seasons))
+        
+        return [fixture for fixtures in results for fixture in fixtures]
+    
+    def save_to_excel(self, fixtures: List[Dict[str, Any]], filename: str) -> Optional[pd.DataFrame]:
+        """Save fixtures to Excel file and return the sorted DataFrame"""
         if not fixtures:
             print("No fixtures to save")
-            return
+            return None
         
         df = pd.DataFrame(fixtures)
         
@@ -113,11 +166,12 @@ class J1LeagueDataExtractor:
         df = df.sort_values('match_date')
         
         # Save to Excel
-        df.to_excel(filename, index=False)
+        write_excel(df, filename)
         print(f"Saved {len(fixtures)} fixtures to {filename}")
         
         # Display summary
         self.display_summary(df)
+        return df
     
     def display_summary(self, df: pd.DataFrame):
         """Display summary statistics"""
@@ -181,16 +235,15 @@ async def main():
     # Get data for current season (2025)
     print("Fetching J1 League halftime results for 2025 season...")
     
-    fixtures = await extractor.get_fixtures(2025)
+    fixtures = await extractor.get_fixtures([2025])
     
     if fixtures:
         # Save to Excel
         filename = "j1_league_2025_halftime_results.xlsx"
-        extractor.save_to_excel(fixtures, filename)
+        df = extractor.save_to_excel(fixtures, filename)
         
         # Also save as CSV for compatibility
         csv_filename = "j1_league_2025_halftime_results.csv"
-        df = pd.DataFrame(fixtures)
         df.to_csv(csv_filename, index=False)
         print(f"Also saved as CSV: {csv_filename}")
         
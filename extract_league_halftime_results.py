@@ -5,10 +5,11 @@ Get all halftime results for any league (configurable League ID)
 
 import asyncio
 import httpx
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-import json
+from typing import Dict, Any, Optional
+import orjson
 import os
 
 class PeruSegundaDataExtractor:
@@ -20,109 +21,151 @@ class PeruSegundaDataExtractor:
             'x-apisports-key': api_key,
             'Accept': 'application/json'
         }
+        self._client: Optional[httpx.AsyncClient] = None
     
-    async def get_fixtures(self, season: int = 2024) -> List[Dict[str, Any]]:
+    async def __aenter__(self):
+        # One pooled client for every request made through this extractor
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            base_url=self.base_url,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._client.aclose()
+        self._client = None
+    
+    async def get_fixtures(self, season: int = 2024) -> Dict[str, Any]:
         """Get all fixtures for Peru Segunda División from start of season to now"""
         print(f"Fetching fixtures for Peru Segunda División (Season {season})...")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Get all fixtures for the league (current season only)
-                params = {
-                    "league": self.league_id,
-                    "season": season,
-                    "from": "2024-01-01",  # Start of current season
-                    "to": datetime.now().strftime("%Y-%m-%d")  # Today
-                }
+        try:
+            # Get all fixtures for the league (current season only)
+            params = {
+                "league": self.league_id,
+                "season": season,
+                "from": "2024-01-01",  # Start of current season
+                "to": datetime.now().strftime("%Y-%m-%d")  # Today
+            }
+            
+            response = await self._client.get("/fixtures", params=params)
+            response.raise_for_status()
+            # Parse the raw body bytes directly
+            data = orjson.loads(response.content)
+            
+            items = data.get("response", [])
+            n = len(items)
+            
+            # Preallocated per-column lists, filled by index
+            fixture_ids = [None] * n
+            match_dates = [None] * n
+            match_statuses = [None] * n
+            venues = [None] * n
+            venue_cities = [None] * n
+            home_team_ids = [None] * n
+            home_team_names = [None] * n
+            away_team_ids = [None] * n
+            away_team_names = [None] * n
+            home_ft_scores = [None] * n
+            away_ft_scores = [None] * n
+            home_ht_scores = [None] * n
+            away_ht_scores = [None] * n
+            
+            for i, fixture_data in enumerate(items):
+                fixture_info = fixture_data.get("fixture", {})
+                teams = fixture_data.get("teams", {})
+                goals = fixture_data.get("goals", {})
+                score = fixture_data.get("score", {})
+                venue = fixture_info.get("venue", {})
+                home = teams.get("home", {})
+                away = teams.get("away", {})
                 
-                response = await client.get(
-                    f"{self.base_url}/fixtures",
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
+                fixture_ids[i] = fixture_info.get("id")
+                match_dates[i] = fixture_info.get("date")
+                match_statuses[i] = fixture_info.get("status", {}).get("short")
+                venues[i] = venue.get("name")
+                venue_cities[i] = venue.get("city")
                 
-                fixtures = []
-                for fixture_data in data.get("response", []):
-                    fixture_info = fixture_data.get("fixture", {})
-                    teams = fixture_data.get("teams", {})
-                    goals = fixture_data.get("goals", {})
-                    score = fixture_data.get("score", {})
-                    
-                    # Extract halftime scores
-                    halftime_score = score.get("halftime", {})
-                    home_ht_goals = halftime_score.get("home")
-                    away_ht_goals = halftime_score.get("away")
-                    
-                    # Extract full-time scores
-                    home_ft_goals = goals.get("home")
-                    away_ft_goals = goals.get("away")
-                    
-                    fixture_info_dict = {
-                        'fixture_id': fixture_info.get("id"),
-                        'league_id': self.league_id,
-                        'league_name': 'Peru Segunda División',
-                        'season': season,
-                        'match_date': fixture_info.get("date"),
-                        'match_status': fixture_info.get("status", {}).get("short"),
-                        'venue': fixture_info.get("venue", {}).get("name"),
-                        'venue_city': fixture_info.get("venue", {}).get("city"),
-                        
-                        # Teams
-                        'home_team_id': teams.get("home", {}).get("id"),
-                        'home_team_name': teams.get("home", {}).get("name"),
-                        'away_team_id': teams.get("away", {}).get("id"),
-                        'away_team_name': teams.get("away", {}).get("name"),
-                        
-                        # Full-time scores
-                        'home_ft_score': home_ft_goals,
-                        'away_ft_score': away_ft_goals,
-                        
-                        # Half-time scores
-                        'home_ht_score': home_ht_goals,
-                        'away_ht_score': away_ht_goals,
-                        
-                        # Total first-half goals
-                        'total_ht_goals': None,
-                        'has_ht_data': False
-                    }
-                    
-                    # Calculate total first-half goals if available
-                    if home_ht_goals is not None and away_ht_goals is not None:
-                        fixture_info_dict['total_ht_goals'] = home_ht_goals + away_ht_goals
-                        fixture_info_dict['has_ht_data'] = True
-                    
-                    fixtures.append(fixture_info_dict)
+                # Teams
+                home_team_ids[i] = home.get("id")
+                home_team_names[i] = home.get("name")
+                away_team_ids[i] = away.get("id")
+                away_team_names[i] = away.get("name")
                 
-                print(f"Found {len(fixtures)} fixtures")
-                return fixtures
+                # Full-time scores
+                home_ft_scores[i] = goals.get("home")
+                away_ft_scores[i] = goals.get("away")
                 
-            except Exception as e:
-                print(f"Error fetching fixtures: {e}")
-                return []
+                # Half-time scores
+                halftime_score = score.get("halftime", {})
+                home_ht_scores[i] = halftime_score.get("home")
+                away_ht_scores[i] = halftime_score.get("away")
+            
+            # Total first-half goals, only where both halftime scores are known
+            home_ht = np.array(home_ht_scores, dtype=float)
+            away_ht = np.array(away_ht_scores, dtype=float)
+            has_ht = ~(np.isnan(home_ht) | np.isnan(away_ht))
+            totals = np.where(has_ht, home_ht + away_ht, 0).astype(np.int64)
+            
+            # Back to Python ints/None so the CSV and JSON keep integer goal counts
+            has_ht_data = has_ht.tolist()
+            total_ht_goals = [total if ok else None for total, ok in zip(totals.tolist(), has_ht_data)]
+            
+            print(f"Found {n} fixtures")
+            if not n:
+                return {}
+            
+            return {
+                'fixture_id': fixture_ids,
+                'league_id': [self.league_id] * n,
+                'league_name': ['Peru Segunda División'] * n,
+                'season': [season] * n,
+                'match_date': match_dates,
+                'match_status': match_statuses,
+                'venue': venues,
+                'venue_city': venue_cities,
+                'home_team_id': home_team_ids,
+                'home_team_name': home_team_names,
+                'away_team_id': away_team_ids,
+                'away_team_name': away_team_names,
+                'home_ft_score': home_ft_scores,
+                'away_ft_score': away_ft_scores,
+                'home_ht_score': home_ht_scores,
+                'away_ht_score': away_ht_scores,
+                'total_ht_goals': total_ht_goals,
+                'has_ht_data': has_ht_data,
+            }
+            
+        except Exception as e:
+            print(f"Error fetching fixtures: {e}")
+            return {}
     
-    async def get_current_season(self) -> List[Dict[str, Any]]:
+    async def get_current_season(self) -> Dict[str, Any]:
         """Get fixtures for current season only (2024-2025)"""
         print(f"\n=== Processing Current Season 2024-2025 ===")
         fixtures = await self.get_fixtures(2024)
         return fixtures
     
-    def save_to_csv(self, fixtures: List[Dict[str, Any]], filename: str):
+    def save_to_csv(self, fixtures: Dict[str, Any], filename: str):
         """Save fixtures to CSV"""
         if not fixtures:
             print("No fixtures to save")
             return
         
-        df = pd.DataFrame(fixtures)
+        # Columns go straight into the frame; dates are parsed once per distinct kickoff
+        df = pd.DataFrame({
+            **fixtures,
+            'match_date': pd.to_datetime(fixtures['match_date'], format="ISO8601", cache=True, utc=True),
+        })
         
         # Sort by match date
-        df['match_date'] = pd.to_datetime(df['match_date'])
         df = df.sort_values('match_date')
         
         # Save to CSV
         df.to_csv(filename, index=False)
-        print(f"Saved {len(fixtures)} fixtures to {filename}")
+        print(f"Saved {len(df)} fixtures to {filename}")
         
         # Display summary
         self.display_summary(df)
@@ -187,13 +230,12 @@ async def main():
         print("Then update your .env file with: APIFOOTBALL_KEY=your_actual_key_here")
         return
     
-    extractor = PeruSegundaDataExtractor(api_key)
-    
     # Get data for current season only (2024-2025)
     print("Fetching Peru Segunda División halftime results for current season...")
     print("Date range: Start of season 2024 to today")
     
-    fixtures = await extractor.get_current_season()
+    async with PeruSegundaDataExtractor(api_key) as extractor:
+        fixtures = await extractor.get_current_season()
     
     if fixtures:
         # Save to CSV with current season filename
@@ -202,8 +244,9 @@ async def main():
         
         # Also save as JSON for detailed analysis
         json_filename = "peru_segunda_current_season_halftime_results.json"
-        with open(json_filename, "w") as f:
-            json.dump(fixtures, f, indent=2, default=str)
+        with open(json_filename, "wb") as f:
+            records = [dict(zip(fixtures, row)) for row in zip(*fixtures.values())]
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2, default=str))
         
         print(f"\n✅ Current season data extraction complete!")
         print(f"📁 CSV file: {filename}")